@@ -4,20 +4,25 @@ import dj_database_url
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Charger variables d'environnement
-load_dotenv()
-
 # Build paths
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Charger variables d'environnement (le fichier .env n'existe qu'en développement,
+# les conteneurs de production reçoivent déjà leurs variables)
+if os.path.exists(BASE_DIR / '.env'):
+    load_dotenv(BASE_DIR / '.env')
+
+# Copie figée de l'environnement : un simple dict, lu une seule fois au chargement
+E = os.environ.copy()
+
 # Secret key
-SECRET_KEY = os.environ.get('SECRET_KEY', 'django-insecure-default-key-for-dev')
+SECRET_KEY = E.get('SECRET_KEY', 'django-insecure-default-key-for-dev')
 
 # Debug mode
-DEBUG = os.environ.get('DEBUG', 'False') == 'True'
+DEBUG = E.get('DEBUG', 'False') == 'True'
 
 # Allowed hosts
-ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '*').split(',')
+ALLOWED_HOSTS = E.get('ALLOWED_HOSTS', '*').split(',')
 
 # Application definition
 INSTALLED_APPS = [
@@ -29,10 +34,9 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     
     # Third party apps
- 
-    'drf_yasg',
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'ckeditor',
     'storages',
@@ -46,6 +50,10 @@ INSTALLED_APPS = [
     'payments',
 ]
 
+# drf_yasg ne sert qu'à la génération du schéma en développement
+if DEBUG:
+    INSTALLED_APPS.append('drf_yasg')
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -59,6 +67,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# En-têtes de sécurité gérés par SecurityMiddleware / XFrameOptionsMiddleware
+SECURE_CONTENT_TYPE_NOSNIFF = True
+X_FRAME_OPTIONS = 'DENY'
+
 ROOT_URLCONF = 'afepanou.urls'
 
 TEMPLATES = [
@@ -92,18 +104,32 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# Le profil est chargé avec l'utilisateur à la connexion (voir core/backends.py)
+AUTHENTICATION_BACKENDS = ['core.backends.ProfileModelBackend']
+
+# Argon2id pour les nouveaux mots de passe (moins coûteux en CPU que PBKDF2 à
+# sécurité comparable) ; les hachages PBKDF2 existants restent valides et sont
+# convertis à la prochaine connexion réussie
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
 # Internationalization
 LANGUAGE_CODE = 'fr-fr'
 TIME_ZONE = 'America/Port-au-Prince'
 USE_I18N = True
 USE_TZ = True
 
-# Static files (CSS, JavaScript, Images)
+# Static files (CSS, JavaScript, Images) : servis localement avec WhiteNoise
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+# WhiteNoise sert uniquement les fichiers collectés, sans parcourir les finders
+WHITENOISE_USE_FINDERS = False
 
-# Media files
+# Media files : stockage local par défaut, B2 si un bucket est configuré (voir plus bas)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
@@ -146,36 +172,56 @@ SIMPLE_JWT = {
 
 
 # CORS settings
-CORS_ALLOWED_ORIGINS = os.environ.get('CORS_ALLOWED_ORIGINS', 'http://localhost:3000').split(',')
+CORS_ALLOWED_ORIGINS = E.get('CORS_ALLOWED_ORIGINS', 'http://localhost:3000').split(',')
 CORS_ALLOW_CREDENTIALS = True
 # CSRF settings
 CSRF_TRUSTED_ORIGINS = [
     'https://afepanoubackend.up.railway.app',
     'https://*.railway.app',
 ]
-if os.environ.get('CSRF_TRUSTED_ORIGINS'):
-    CSRF_TRUSTED_ORIGINS.extend(os.environ.get('CSRF_TRUSTED_ORIGINS').split(','))
+_CSRF_TRUSTED_ORIGINS = E.get('CSRF_TRUSTED_ORIGINS')
+if _CSRF_TRUSTED_ORIGINS:
+    CSRF_TRUSTED_ORIGINS.extend(_CSRF_TRUSTED_ORIGINS.split(','))
 # Cache with Redis
-if os.environ.get('REDIS_URL'):
+REDIS_URL = E.get('REDIS_URL')
+if REDIS_URL:
     CACHES = {
         'default': {
             'BACKEND': 'django_redis.cache.RedisCache',
-            'LOCATION': os.environ.get('REDIS_URL'),
+            'LOCATION': REDIS_URL,
             'OPTIONS': {
                 'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                # Pool borné et bloquant : réutilise les connexions par worker
+                'CONNECTION_POOL_CLASS': 'redis.connection.BlockingConnectionPool',
+                'CONNECTION_POOL_CLASS_KWARGS': {
+                    'max_connections': int(E.get('REDIS_MAX_CONNECTIONS', 50)),
+                    'timeout': float(E.get('REDIS_POOL_TIMEOUT', 1.0)),
+                },
+                'SOCKET_CONNECT_TIMEOUT': 2,
+                'SOCKET_TIMEOUT': 2,
+                # Une indisponibilité de Redis ne doit pas faire échouer la requête
+                'IGNORE_EXCEPTIONS': True,
             }
         }
     }
+    DJANGO_REDIS_IGNORE_EXCEPTIONS = True
     # Session cache
     SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
     SESSION_CACHE_ALIAS = 'default'
 
-# B2 Blackblaze Storage
+MONCASH_CLIENT_ID = E.get("MONCASH_CLIENT_ID")
+MONCASH_CLIENT_SECRET = E.get("MONCASH_CLIENT_SECRET")
+MONCASH_API_HOST = E.get("MONCASH_API_HOST")
+MONCASH_GATEWAY_URL = E.get("MONCASH_GATEWAY_URL")
+MONCASH_MODE = E.get("MONCASH_MODE", "sandbox")
+MONCASH_RETURN_URL = E.get("MONCASH_RETURN_URL")
+MONCASH_CANCEL_URL = E.get("MONCASH_CANCEL_URL", MONCASH_RETURN_URL)
+
 # Configuration des stockages Django - Séparation claire B2/Local
 STORAGES = {
-    # Fichiers média : stockés sur Backblaze B2
+    # Fichiers média : stockés localement, ou sur Backblaze B2 si configuré
     'default': {
-        'BACKEND': 'storages.backends.s3boto3.S3Boto3Storage',
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
     },
     # Fichiers statiques : stockés localement avec WhiteNoise
     'staticfiles': {
@@ -183,34 +229,27 @@ STORAGES = {
     },
 }
 
-MONCASH_CLIENT_ID = os.environ.get("MONCASH_CLIENT_ID")
-MONCASH_CLIENT_SECRET = os.environ.get("MONCASH_CLIENT_SECRET")
-MONCASH_API_HOST = os.environ.get("MONCASH_API_HOST")
-MONCASH_GATEWAY_URL = os.environ.get("MONCASH_GATEWAY_URL")
-MONCASH_MODE = os.environ.get("MONCASH_MODE", default="sandbox")
-MONCASH_RETURN_URL = os.environ.get("MONCASH_RETURN_URL")
-MONCASH_CANCEL_URL = os.environ.get("MONCASH_CANCEL_URL", default=MONCASH_RETURN_URL)
-
 # === CONFIGURATION BACKBLAZE B2 (MÉDIAS UNIQUEMENT) ===
-AWS_ACCESS_KEY_ID = os.environ.get('B2_KEY_ID')
-AWS_SECRET_ACCESS_KEY = os.environ.get('B2_KEY')
-AWS_STORAGE_BUCKET_NAME = os.environ.get('B2_BUCKET_NAME')
-AWS_S3_ENDPOINT_URL = 'https://s3.us-west-000.backblazeb2.com'  # Adapter selon votre région
-AWS_S3_REGION_NAME = 'us-west-000'  # Adapter selon votre région
-AWS_LOCATION = os.environ.get('B2_LOCATION', '')  # Préfixe de chemin optionnel pour les médias
-AWS_DEFAULT_ACL = 'public-read'
-AWS_QUERYSTRING_AUTH = False
-AWS_S3_FILE_OVERWRITE = False
-AWS_S3_CUSTOM_DOMAIN = None
-AWS_S3_OBJECT_PARAMETERS = {
-    'CacheControl': 'max-age=86400',  # Cache de 24h pour les fichiers média
-}
-
-# === CONFIGURATION FICHIERS STATIQUES (DJANGO/WHITENOISE) ===
-STATIC_URL = '/static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+B2_BUCKET_NAME = E.get('B2_BUCKET_NAME')
+USE_B2_STORAGE = bool(B2_BUCKET_NAME)
+if USE_B2_STORAGE:
+    B2_LOCATION = E.get('B2_LOCATION', '')
+    STORAGES['default']['BACKEND'] = 'core.storage.B2MediaStorage'
+
+    AWS_ACCESS_KEY_ID = E.get('B2_KEY_ID')
+    AWS_SECRET_ACCESS_KEY = E.get('B2_KEY')
+    AWS_STORAGE_BUCKET_NAME = B2_BUCKET_NAME
+    AWS_S3_ENDPOINT_URL = 'https://s3.us-west-000.backblazeb2.com'  # Adapter selon votre région
+    AWS_S3_REGION_NAME = 'us-west-000'  # Adapter selon votre région
+    AWS_LOCATION = B2_LOCATION  # Préfixe de chemin optionnel pour les médias
+    AWS_DEFAULT_ACL = 'public-read'
+    AWS_QUERYSTRING_AUTH = False
+    AWS_S3_FILE_OVERWRITE = False
+    # URLs publiques construites directement, sans passer par la génération d'URL de boto3
+    _b2_host = f'{B2_BUCKET_NAME}.s3.{AWS_S3_REGION_NAME}.backblazeb2.com'
+    AWS_S3_CUSTOM_DOMAIN = _b2_host
+    AWS_S3_OBJECT_PARAMETERS = {
+        'CacheControl': 'max-age=86400',  # Cache de 24h pour les fichiers média
+    }
 
-# === CONFIGURATION FICHIERS MÉDIAS (B2) ===
-MEDIA_URL = f'https://{os.environ.get("B2_BUCKET_NAME")}.s3.{AWS_S3_REGION_NAME}.backblazeb2.com/'
-if os.environ.get('B2_LOCATION'):
-    MEDIA_URL += f'{os.environ.get("B2_LOCATION")}/'
\ No newline at end of file
+    MEDIA_URL = f'https://{_b2_host}/' + (f'{B2_LOCATION}/' if B2_LOCATION else '')
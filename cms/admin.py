@@ -2,10 +2,76 @@ from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from django.utils.html import format_html
-from django.urls import reverse
-from django.db import models
+from django.urls import reverse, path
+from django.http import Http404, HttpResponse
+from django.template.loader import render_to_string
+from django.db import models, transaction
+from django.db.models import Count
+from django.core.cache import cache
 
 from .models import Category, Tag, Author, Article, Page
+from .cache import get_cache_version, invalidate_cache
+
+# Filtres
+# Les choix des filtres sont mis en cache pour éviter de relire toutes les
+# catégories, tags et auteurs à chaque affichage de la liste des articles
+FILTER_CHOICES_CACHE_TIMEOUT = 60 * 5
+
+class ArticleCategoryFilter(admin.SimpleListFilter):
+    title = _("Catégorie")
+    parameter_name = 'category'
+    
+    def lookups(self, request, model_admin):
+        return cache.get_or_set(
+            'cms:category_choices',
+            lambda: list(Category.objects.order_by('name').values_list('slug', 'name')),
+            FILTER_CHOICES_CACHE_TIMEOUT
+        )
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(categories__slug=self.value())
+        return queryset
+
+class ArticleTagFilter(admin.SimpleListFilter):
+    title = _("Tag")
+    parameter_name = 'tag'
+    
+    def lookups(self, request, model_admin):
+        return cache.get_or_set(
+            'cms:tag_choices',
+            lambda: list(Tag.objects.order_by('name').values_list('slug', 'name')),
+            FILTER_CHOICES_CACHE_TIMEOUT
+        )
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(tags__slug=self.value())
+        return queryset
+
+class ArticleAuthorFilter(admin.SimpleListFilter):
+    title = _("Auteur")
+    parameter_name = 'author'
+    
+    def lookups(self, request, model_admin):
+        return cache.get_or_set('cms:author_choices', self.get_author_choices, FILTER_CHOICES_CACHE_TIMEOUT)
+    
+    @staticmethod
+    def get_author_choices():
+        # Même libellé que Author.__str__, sans construire les objets
+        authors = (
+            Author.objects.order_by('user__username')
+            .values_list('id', 'user__first_name', 'user__last_name', 'user__username')
+        )
+        return [
+            (author_id, f"{first_name} {last_name}".strip() or username)
+            for author_id, first_name, last_name, username in authors
+        ]
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(author_id=self.value())
+        return queryset
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -15,9 +81,13 @@ class CategoryAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('name',)}
     readonly_fields = ('created_at', 'updated_at')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_article_count=Count('articles'))
+    
     def article_count(self, obj):
-        return obj.articles.count()
+        return obj._article_count
     article_count.short_description = _("Nombre d'articles")
+    article_count.admin_order_field = '_article_count'
     
     fieldsets = (
         (None, {
@@ -35,9 +105,13 @@ class TagAdmin(admin.ModelAdmin):
     search_fields = ('name',)
     prepopulated_fields = {'slug': ('name',)}
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_article_count=Count('articles'))
+    
     def article_count(self, obj):
-        return obj.articles.count()
+        return obj._article_count
     article_count.short_description = _("Nombre d'articles")
+    article_count.admin_order_field = '_article_count'
 
 @admin.register(Author)
 class AuthorAdmin(admin.ModelAdmin):
@@ -49,9 +123,13 @@ class AuthorAdmin(admin.ModelAdmin):
         return obj.user.get_full_name() or obj.user.username
     display_name.short_description = _("Nom")
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_article_count=Count('articles'))
+    
     def article_count(self, obj):
-        return obj.articles.count()
+        return obj._article_count
     article_count.short_description = _("Nombre d'articles")
+    article_count.admin_order_field = '_article_count'
     
     def display_avatar(self, obj):
         if obj.avatar:
@@ -68,22 +146,10 @@ class AuthorAdmin(admin.ModelAdmin):
         }),
     )
 
-class ArticleTagsInline(admin.TabularInline):
-    model = Article.tags.through
-    extra = 1
-    verbose_name = _("Tag")
-    verbose_name_plural = _("Tags")
-
-class ArticleCategoriesInline(admin.TabularInline):
-    model = Article.categories.through
-    extra = 1
-    verbose_name = _("Catégorie")
-    verbose_name_plural = _("Catégories")
-
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
     list_display = ('title', 'author', 'status', 'display_categories', 'display_featured_image', 'published_at', 'created_at')
-    list_filter = ('status', 'categories', 'tags', 'author', 'created_at', 'published_at')
+    list_filter = ('status', ArticleCategoryFilter, ArticleTagFilter, ArticleAuthorFilter, 'created_at', 'published_at')
     search_fields = ('title', 'content', 'author__user__username', 'author__user__first_name', 'author__user__last_name')
     prepopulated_fields = {'slug': ('title',)}
     readonly_fields = ('created_at', 'updated_at', 'article_preview')
@@ -109,9 +175,19 @@ class ArticleAdmin(admin.ModelAdmin):
         }),
     )
     filter_horizontal = ('categories', 'tags')
+    list_select_related = ('author', 'author__user')
+    
+    def get_queryset(self, request):
+        return (
+            super().get_queryset(request)
+            .select_related('author__user')
+            .prefetch_related('categories', 'tags')
+            .for_listing()
+        )
     
     def display_categories(self, obj):
-        return ", ".join([category.name for category in obj.categories.all()[:3]])
+        # Découpage en Python pour réutiliser le prefetch au lieu d'une requête LIMIT par ligne
+        return ", ".join([category.name for category in list(obj.categories.all())[:3]])
     display_categories.short_description = _("Catégories")
     
     def display_featured_image(self, obj):
@@ -136,7 +212,6 @@ class ArticleAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
     
     def get_urls(self):
-        from django.urls import path
         urls = super().get_urls()
         custom_urls = [
             path(
@@ -148,26 +223,45 @@ class ArticleAdmin(admin.ModelAdmin):
         return custom_urls + urls
     
     def article_preview_view(self, request, article_id):
-        from django.http import HttpResponse
-        from django.template.loader import render_to_string
-        
         article = self.get_object(request, article_id)
+        if article is None:
+            raise Http404
         context = {
             'article': article,
             'is_preview': True,
         }
-        content = render_to_string('cms/article_preview.html', context)
+        # La clé inclut la version de l'espace 'articles', que les signaux de
+        # cms/models.py changent aussi pour l'auteur, les catégories et les tags
+        key = f"cms:article_preview:{get_cache_version('articles')}:{article.pk}"
+        content = cache.get(key)
+        if content is None:
+            content = render_to_string('cms/article_preview.html', context)
+            cache.set(key, content, 600)
         return HttpResponse(content)
     
     actions = ['make_published', 'make_draft']
     
+    def _selected_ids(self, queryset, status):
+        # Les filtres de la liste (catégorie, tag) ajoutent des jointures : un update()
+        # direct deviendrait un UPDATE ... WHERE id IN (SELECT ...). On matérialise les ids.
+        return list(queryset.filter(status=status).values_list('pk', flat=True))
+    
     def make_published(self, request, queryset):
-        updated = queryset.filter(status='draft').update(status='published', published_at=timezone.now())
+        now = timezone.now()
+        with transaction.atomic():
+            updated = Article.objects.filter(pk__in=self._selected_ids(queryset, 'draft')).update(
+                status='published', published_at=now, updated_at=now
+            )
+        invalidate_cache('articles')
         self.message_user(request, _(f"{updated} article(s) ont été publiés."))
     make_published.short_description = _("Publier les articles sélectionnés")
     
     def make_draft(self, request, queryset):
-        updated = queryset.filter(status='published').update(status='draft')
+        with transaction.atomic():
+            updated = Article.objects.filter(pk__in=self._selected_ids(queryset, 'published')).update(
+                status='draft', updated_at=timezone.now()
+            )
+        invalidate_cache('articles')
         self.message_user(request, _(f"{updated} article(s) ont été mis en brouillon."))
     make_draft.short_description = _("Mettre en brouillon les articles sélectionnés")
 
@@ -203,7 +297,6 @@ class PageAdmin(admin.ModelAdmin):
     page_preview.short_description = _("Aperçu")
     
     def get_urls(self):
-        from django.urls import path
         urls = super().get_urls()
         custom_urls = [
             path(
@@ -215,26 +308,33 @@ class PageAdmin(admin.ModelAdmin):
         return custom_urls + urls
     
     def page_preview_view(self, request, page_id):
-        from django.http import HttpResponse
-        from django.template.loader import render_to_string
-        
         page = self.get_object(request, page_id)
+        if page is None:
+            raise Http404
         context = {
             'page': page,
             'is_preview': True,
         }
-        content = render_to_string('cms/page_preview.html', context)
+        # La clé inclut la version de l'espace 'pages' : toute modification
+        # invalide l'aperçu en cache
+        key = f"cms:page_preview:{get_cache_version('pages')}:{page.pk}"
+        content = cache.get(key)
+        if content is None:
+            content = render_to_string('cms/page_preview.html', context)
+            cache.set(key, content, 600)
         return HttpResponse(content)
     
     actions = ['make_active', 'make_inactive']
     
     def make_active(self, request, queryset):
-        updated = queryset.filter(is_active=False).update(is_active=True)
+        updated = queryset.filter(is_active=False).update(is_active=True, updated_at=timezone.now())
+        invalidate_cache('pages')
         self.message_user(request, _(f"{updated} page(s) ont été activées."))
     make_active.short_description = _("Activer les pages sélectionnées")
     
     def make_inactive(self, request, queryset):
-        updated = queryset.filter(is_active=True).update(is_active=False)
+        updated = queryset.filter(is_active=True).update(is_active=False, updated_at=timezone.now())
+        invalidate_cache('pages')
         self.message_user(request, _(f"{updated} page(s) ont été désactivées."))
     make_inactive.short_description = _("Désactiver les pages sélectionnées")
 
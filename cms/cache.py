@@ -0,0 +1,25 @@
+# cms/cache.py
+import time
+
+from django.core.cache import cache
+
+# Durée de vie des réponses API mises en cache
+API_CACHE_TIMEOUT = 60 * 15
+
+def _version_key(namespace):
+    return f'cms:{namespace}:version'
+
+def get_cache_version(namespace):
+    """
+    Version courante d'un espace de cache ('pages', 'articles').
+    
+    La version est un horodatage : même si la clé est évincée, la nouvelle
+    valeur ne peut pas coïncider avec celle d'entrées plus anciennes.
+    """
+    return cache.get_or_set(_version_key(namespace), time.time_ns, None)
+
+def invalidate_cache(namespace):
+    """
+    Invalide toutes les réponses d'un espace de cache en changeant sa version.
+    """
+    cache.set(_version_key(namespace), time.time_ns(), None)
@@ -1,6 +1,6 @@
 # blog/filters.py
 from django_filters import rest_framework as filters
-from .models import Article, Category, Tag
+from .models import Article, Category
 
 class ArticleFilter(filters.FilterSet):
     """
@@ -10,18 +10,23 @@ class ArticleFilter(filters.FilterSet):
     category = filters.ModelMultipleChoiceFilter(
         field_name='categories__slug',
         to_field_name='slug',
-        queryset=Category.objects.all()
+        queryset=lambda request: Category.objects.only('slug')
     )
-    tag = filters.ModelMultipleChoiceFilter(
-        field_name='tags__slug',
-        to_field_name='slug',
-        queryset=Tag.objects.all()
-    )
-    author = filters.CharFilter(field_name='author__user__username')
+    # Liste de slugs séparés par des virgules, sans requête de validation des choix
+    tag = filters.CharFilter(method='filter_by_tag_slugs')
+    # Égalité stricte : s'appuie sur l'index unique de auth_user.username et sur
+    # l'index de la clé étrangère author_id (un iexact ne pourrait utiliser ni l'un ni l'autre)
+    author = filters.CharFilter(field_name='author__user__username', lookup_expr='exact')
     status = filters.ChoiceFilter(field_name='status', choices=Article.STATUS_CHOICES)
     created_after = filters.DateFilter(field_name='created_at', lookup_expr='gte')
     created_before = filters.DateFilter(field_name='created_at', lookup_expr='lte')
     
     class Meta:
         model = Article
-        fields = ['title', 'category', 'tag', 'author', 'status', 'created_after', 'created_before']
\ No newline at end of file
+        fields = ['title', 'category', 'tag', 'author', 'status', 'created_after', 'created_before']
+    
+    def filter_by_tag_slugs(self, queryset, name, value):
+        slugs = [slug.strip() for slug in value.split(',') if slug.strip()]
+        if not slugs:
+            return queryset
+        return queryset.filter(tags__slug__in=slugs).distinct()
\ No newline at end of file
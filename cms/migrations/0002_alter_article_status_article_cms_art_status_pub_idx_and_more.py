@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='article',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Brouillon'), ('published', 'Publié')], db_index=True, default='draft', max_length=10, verbose_name='Statut'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', '-published_at'], name='cms_art_status_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['author', '-published_at'], name='cms_art_author_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-created_at'], name='cms_art_created_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0002_alter_article_status_article_cms_art_status_pub_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='featured_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name="Hauteur de l'image"),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='featured_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name="Largeur de l'image"),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='avatar_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name="Hauteur de l'avatar"),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='avatar_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name="Largeur de l'avatar"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0003_article_featured_image_height_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', '-created_at'], name='cms_art_status_created_idx'),
+        ),
+    ]
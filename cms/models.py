@@ -1,9 +1,12 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
 from django.utils.text import slugify
 from django.contrib.auth.models import User
 from ckeditor.fields import RichTextField
 from django.utils.translation import gettext_lazy as _
 from core.models import TimeStampedModel
+from .cache import invalidate_cache
 
 class Category(TimeStampedModel):
     """
@@ -56,15 +59,43 @@ class Author(models.Model):
     )
     bio = models.TextField(_("Biographie"))
     avatar = models.ImageField(_("Avatar"), upload_to='authors/', blank=True)
+    avatar_width = models.PositiveIntegerField(_("Largeur de l'avatar"), null=True, blank=True, editable=False)
+    avatar_height = models.PositiveIntegerField(_("Hauteur de l'avatar"), null=True, blank=True, editable=False)
     website = models.URLField(_("Site web"), blank=True)
     
     def __str__(self):
         return self.user.get_full_name() or self.user.username
     
+    def save(self, *args, **kwargs):
+        # Dimensions lues sur le fichier téléversé, avant son envoi au stockage
+        # (width_field/height_field relirait l'image sur B2 au chargement des lignes sans dimensions)
+        if self.avatar and not self.avatar._committed:
+            self.avatar_width, self.avatar_height = self.avatar.width, self.avatar.height
+        super().save(*args, **kwargs)
+    
     class Meta:
         verbose_name = _("Auteur")
         verbose_name_plural = _("Auteurs")
 
+class ArticleQuerySet(models.QuerySet):
+    """
+    QuerySet des articles.
+    """
+    def for_listing(self):
+        """Exclut le contenu HTML, inutile pour les listes."""
+        return self.defer('content')
+    
+    def bulk_create_with_slugs(self, objs, **kwargs):
+        """
+        Crée les articles en une seule requête INSERT. bulk_create ne passe pas
+        par save(), les slugs manquants sont donc calculés ici.
+        """
+        objs = list(objs)
+        for obj in objs:
+            if not obj.slug:
+                obj.slug = slugify(obj.title)
+        return self.bulk_create(objs, **kwargs)
+
 class Article(TimeStampedModel):
     """
     Articles de blog.
@@ -84,6 +115,8 @@ class Article(TimeStampedModel):
     )
     content = RichTextField(_("Contenu"))
     featured_image = models.ImageField(_("Image à la une"), upload_to='blog/')
+    featured_image_width = models.PositiveIntegerField(_("Largeur de l'image"), null=True, blank=True, editable=False)
+    featured_image_height = models.PositiveIntegerField(_("Hauteur de l'image"), null=True, blank=True, editable=False)
     categories = models.ManyToManyField(
         Category, 
         related_name='articles',
@@ -98,22 +131,36 @@ class Article(TimeStampedModel):
         _("Statut"), 
         max_length=10, 
         choices=STATUS_CHOICES, 
-        default='draft'
+        default='draft',
+        db_index=True
     )
     published_at = models.DateTimeField(_("Date de publication"), null=True, blank=True)
     
+    objects = ArticleQuerySet.as_manager()
+    
     def __str__(self):
         return self.title
     
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        # Voir Author.save()
+        if self.featured_image and not self.featured_image._committed:
+            self.featured_image_width = self.featured_image.width
+            self.featured_image_height = self.featured_image.height
         super().save(*args, **kwargs)
     
     class Meta:
         verbose_name = _("Article")
         verbose_name_plural = _("Articles")
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            models.Index(fields=['status', '-published_at'], name='cms_art_status_pub_idx'),
+            models.Index(fields=['author', '-published_at'], name='cms_art_author_pub_idx'),
+            models.Index(fields=['-created_at'], name='cms_art_created_idx'),
+            # Liste publique de l'API : status='published' trié par le curseur (-created_at)
+            models.Index(fields=['status', '-created_at'], name='cms_art_status_created_idx'),
+        ]
 
 class Page(TimeStampedModel):
     """
@@ -134,4 +181,20 @@ class Page(TimeStampedModel):
     
     class Meta:
         verbose_name = _("Page")
-        verbose_name_plural = _("Pages")
\ No newline at end of file
+        verbose_name_plural = _("Pages")
+
+
+@receiver([post_save, post_delete], sender=Page)
+def invalidate_page_cache(sender, **kwargs):
+    """Invalide les réponses API des pages mises en cache"""
+    invalidate_cache('pages')
+
+@receiver([post_save, post_delete], sender=Article)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Author)
+@receiver(m2m_changed, sender=Article.categories.through)
+@receiver(m2m_changed, sender=Article.tags.through)
+def invalidate_article_cache(sender, **kwargs):
+    """Invalide les réponses API des articles mises en cache"""
+    invalidate_cache('articles')
@@ -0,0 +1,13 @@
+# cms/pagination.py
+from rest_framework.pagination import CursorPagination
+
+class ArticleCursorPagination(CursorPagination):
+    """
+    Pagination par curseur pour les articles : chaque page est une lecture
+    d'index, quelle que soit sa profondeur, au lieu d'un OFFSET croissant.
+    
+    Le curseur porte sur created_at, toujours renseigné, plutôt que sur
+    published_at qui est nul pour les brouillons.
+    """
+    ordering = '-created_at'
+    page_size = 20
@@ -1,10 +1,13 @@
 # cms/serializers.py
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.utils import timezone
+from core.serializers import CachedFieldsSerializerMixin, BulkPrimaryKeyRelatedField
 from .models import Page, Article, Category, Tag, Author
+from .cache import invalidate_cache
 
 # Serializers de base
-class UserBasicSerializer(serializers.ModelSerializer):
+class UserBasicSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer basique pour les utilisateurs.
     """
@@ -13,7 +16,7 @@ class UserBasicSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'first_name', 'last_name']
 
 # CMS Serializers
-class PageSerializer(serializers.ModelSerializer):
+class PageSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour les pages CMS.
     """
@@ -26,7 +29,7 @@ class PageSerializer(serializers.ModelSerializer):
         }
 
 # Blog Serializers
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour les catégories d'articles.
     """
@@ -38,7 +41,7 @@ class CategorySerializer(serializers.ModelSerializer):
             'slug': {'required': False}
         }
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour les tags d'articles.
     """
@@ -50,7 +53,7 @@ class TagSerializer(serializers.ModelSerializer):
             'slug': {'required': False}
         }
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour les auteurs d'articles.
     """
@@ -63,37 +66,40 @@ class AuthorSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Author
-        fields = ['id', 'user', 'user_id', 'bio', 'avatar', 'website']
-        read_only_fields = ['id']
+        fields = ['id', 'user', 'user_id', 'bio', 'avatar', 'avatar_width', 'avatar_height', 'website']
+        read_only_fields = ['id', 'avatar_width', 'avatar_height']
     
     def create(self, validated_data):
         user = validated_data.pop('user')
         author = Author.objects.create(user=user, **validated_data)
         return author
 
-class ArticleListSerializer(serializers.ModelSerializer):
+class AuthorCompactSerializer(CachedFieldsSerializerMixin, serializers.Serializer):
+    """
+    Auteur résumé d'un article, lu sur l'article annoté par
+    ArticleViewSet (author_name est calculé en SQL).
+    """
+    id = serializers.IntegerField(source='author_id', read_only=True)
+    name = serializers.CharField(source='author_name', read_only=True)
+
+class ArticleListSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour la liste des articles (version allégée).
     """
-    author = serializers.SerializerMethodField()
+    author = AuthorCompactSerializer(source='*', read_only=True)
     categories = CategorySerializer(many=True, read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     
     class Meta:
         model = Article
         fields = [
-            'id', 'title', 'slug', 'author', 'featured_image', 
+            'id', 'title', 'slug', 'author', 'featured_image',
+            'featured_image_width', 'featured_image_height',
             'categories', 'tags', 'status', 'published_at', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at']
-    
-    def get_author(self, obj):
-        return {
-            'id': obj.author.id,
-            'name': obj.author.user.get_full_name() or obj.author.user.username
-        }
+        read_only_fields = ['id', 'featured_image_width', 'featured_image_height', 'created_at']
 
-class ArticleDetailSerializer(serializers.ModelSerializer):
+class ArticleDetailSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour le détail d'un article.
     """
@@ -104,7 +110,7 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
         write_only=True
     )
     categories = CategorySerializer(many=True, read_only=True)
-    category_ids = serializers.PrimaryKeyRelatedField(
+    category_ids = BulkPrimaryKeyRelatedField(
         source='categories',
         queryset=Category.objects.all(),
         many=True,
@@ -112,7 +118,7 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
         required=False
     )
     tags = TagSerializer(many=True, read_only=True)
-    tag_ids = serializers.PrimaryKeyRelatedField(
+    tag_ids = BulkPrimaryKeyRelatedField(
         source='tags',
         queryset=Tag.objects.all(),
         many=True,
@@ -124,10 +130,11 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
         model = Article
         fields = [
             'id', 'title', 'slug', 'author', 'author_id', 'content', 'featured_image',
+            'featured_image_width', 'featured_image_height',
             'categories', 'category_ids', 'tags', 'tag_ids', 'status',
             'published_at', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'featured_image_width', 'featured_image_height', 'created_at', 'updated_at']
         extra_kwargs = {
             'slug': {'required': False}
         }
@@ -153,10 +160,24 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
         categories = validated_data.pop('categories', None)
         tags = validated_data.pop('tags', None)
         
-        # Mettre à jour les champs simples
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        # Mettre à jour les champs simples. Un nouveau fichier doit passer par
+        # save() pour être stocké (et ses dimensions calculées) ; sinon un seul
+        # UPDATE ne porte que sur les colonnes modifiées.
+        changed = {
+            attr: value for attr, value in validated_data.items()
+            if attr == 'featured_image' or getattr(instance, attr) != value
+        }
+        if 'featured_image' in changed:
+            for attr, value in changed.items():
+                setattr(instance, attr, value)
+            instance.save()
+        elif changed:
+            changed['updated_at'] = timezone.now()
+            Article.objects.filter(pk=instance.pk).update(**changed)
+            for attr, value in changed.items():
+                setattr(instance, attr, value)
+            # update() n'envoie pas post_save : invalider le cache de l'API ici
+            invalidate_cache('articles')
         
         # Mettre à jour les relations many-to-many
         if categories is not None:
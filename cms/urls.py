@@ -1,9 +1,9 @@
 # cms/urls.py
-from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import PageViewSet, ArticleViewSet, CategoryViewSet, TagViewSet, AuthorViewSet
 
-router = DefaultRouter()
+# Routes en convertisseurs de chemin (<slug:slug>, <int:pk>) plutôt qu'en regex
+router = DefaultRouter(use_regex_path=False)
 
 # CMS routes
 router.register(r'pages', PageViewSet, basename='page')
@@ -16,6 +16,4 @@ router.register(r'blog/authors', AuthorViewSet, basename='author')
 
 app_name = 'cms'
 
-urlpatterns = [
-    path('', include(router.urls)),
-]
\ No newline at end of file
+urlpatterns = router.urls
\ No newline at end of file
@@ -2,7 +2,10 @@
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.shortcuts import get_object_or_404
+from rest_framework.utils.encoders import JSONEncoder
+from django.http import Http404, StreamingHttpResponse
+from django.db.models import Prefetch, Value
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Page, Article, Category, Tag, Author
 from .serializers import (
@@ -11,9 +14,57 @@ from .serializers import (
 )
 from .permissions import IsAdminOrReadOnly
 from .filters import ArticleFilter
+from .pagination import ArticleCursorPagination
+from .cache import API_CACHE_TIMEOUT, get_cache_version
+from django.core.cache import cache
+import json
+
+class CachedResponseMixin:
+    """
+    Met en cache les réponses de lecture pour les visiteurs non-admin.
+    
+    La clé contient l'URL complète et la version de l'espace de cache, que les
+    signaux de cms/models.py changent à chaque modification du contenu.
+    
+    Les slugs inconnus ou non publics (robots, scanners) sont aussi mémorisés,
+    chacun sous sa propre clé : les demandes suivantes reçoivent un 404 sans
+    requête. Si le cache est indisponible, la recherche normale s'applique.
+    """
+    cache_namespace = None
+    
+    def get_cached_response(self, request, view_func, *args, **kwargs):
+        if request.user.is_staff:
+            return view_func(request, *args, **kwargs)
+        
+        version = get_cache_version(self.cache_namespace)
+        key = f'cms:{self.cache_namespace}:{version}:{request.build_absolute_uri()}'
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        
+        slug = kwargs.get(self.lookup_field)
+        missing_key = f'cms:{self.cache_namespace}:{version}:slug:{slug}'
+        if slug is not None and cache.get(missing_key):
+            raise Http404
+        
+        try:
+            response = view_func(request, *args, **kwargs)
+        except Http404:
+            if slug is not None:
+                cache.set(missing_key, True, API_CACHE_TIMEOUT)
+            raise
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, API_CACHE_TIMEOUT)
+        return response
+    
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().list, *args, **kwargs)
+    
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().retrieve, *args, **kwargs)
 
 # CMS Views
-class PageViewSet(viewsets.ModelViewSet):
+class PageViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """
     API pour la gestion des pages CMS.
     
@@ -39,6 +90,8 @@ class PageViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'content']
     ordering_fields = ['title', 'created_at', 'updated_at']
     lookup_field = 'slug'
+    lookup_value_converter = 'slug'
+    cache_namespace = 'pages'
     
     def get_queryset(self):
         """
@@ -48,15 +101,6 @@ class PageViewSet(viewsets.ModelViewSet):
         if not self.request.user.is_staff:
             queryset = queryset.filter(is_active=True)
         return queryset
-    
-    @action(detail=False, methods=['get'], url_path='by-slug/(?P<slug>[-\w]+)')
-    def by_slug(self, request, slug=None):
-        """
-        Récupère une page par son slug.
-        """
-        page = get_object_or_404(self.get_queryset(), slug=slug)
-        serializer = self.get_serializer(page)
-        return Response(serializer.data)
 
 # Blog Views
 class CategoryViewSet(viewsets.ModelViewSet):
@@ -67,6 +111,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
     serializer_class = CategorySerializer
     permission_classes = [IsAdminOrReadOnly]
     lookup_field = 'slug'
+    lookup_value_converter = 'slug'
     
     # Restreindre les actions disponibles
     http_method_names = ['get', 'post', 'put', 'delete']
@@ -79,6 +124,7 @@ class TagViewSet(viewsets.ModelViewSet):
     serializer_class = TagSerializer
     permission_classes = [IsAdminOrReadOnly]
     lookup_field = 'slug'
+    lookup_value_converter = 'slug'
     
     # Restreindre les actions disponibles
     http_method_names = ['get', 'post', 'put', 'delete']
@@ -93,8 +139,14 @@ class AuthorViewSet(viewsets.ReadOnlyModelViewSet):
     
     # Restreindre les actions disponibles (lecture seule)
     http_method_names = ['get']
+    
+    def get_queryset(self):
+        """
+        Charge l'utilisateur dans la même requête (UserBasicSerializer imbriqué).
+        """
+        return Author.objects.select_related('user')
 
-class ArticleViewSet(viewsets.ModelViewSet):
+class ArticleViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """
     API pour la gestion des articles de blog.
     
@@ -115,17 +167,36 @@ class ArticleViewSet(viewsets.ModelViewSet):
     """
     queryset = Article.objects.all()
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = ArticleCursorPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_class = ArticleFilter
     search_fields = ['title', 'content']
     ordering_fields = ['title', 'published_at', 'created_at']
     lookup_field = 'slug'
+    lookup_value_converter = 'slug'
+    cache_namespace = 'articles'
+    
+    LIST_FIELDS = (
+        'id', 'title', 'slug', 'author_id', 'featured_image', 'featured_image_width',
+        'featured_image_height', 'status', 'published_at', 'created_at',
+    )
+    
+    def filter_queryset(self, queryset):
+        """
+        Sans paramètre de filtre, de recherche ou de tri (le curseur de
+        pagination et le format ne comptent pas), les backends ne changeraient
+        rien : on évite la construction du FilterSet et de son formulaire.
+        """
+        params = set(self.request.query_params) - {self.pagination_class.cursor_query_param, 'format'}
+        if not params:
+            return queryset
+        return super().filter_queryset(queryset)
     
     def get_serializer_class(self):
         """
         Retourne différents serializers selon l'action.
         """
-        if self.action == 'list':
+        if self.action in ('list', 'export'):
             return ArticleListSerializer
         return ArticleDetailSerializer
     
@@ -133,16 +204,48 @@ class ArticleViewSet(viewsets.ModelViewSet):
         """
         Filtre les articles pour les utilisateurs non-admin.
         """
-        queryset = Article.objects.all().select_related('author', 'author__user').prefetch_related('categories', 'tags')
+        if self.action == 'destroy':
+            # La suppression n'a besoin ni du contenu ni des relations
+            return Article.objects.only('id', 'slug')
+        
+        queryset = Article.objects.prefetch_related(
+            Prefetch('categories', queryset=Category.objects.only(*CategorySerializer.Meta.fields)),
+            Prefetch('tags', queryset=Tag.objects.only(*TagSerializer.Meta.fields)),
+        )
+        if self.action in ('list', 'export'):
+            # Seules les colonnes lues par ArticleListSerializer ; l'auteur est
+            # l'équivalent SQL de get_full_name() or username (AuthorCompactSerializer)
+            queryset = queryset.only(*self.LIST_FIELDS).annotate(
+                author_name=Coalesce(
+                    NullIf(Trim(Concat('author__user__first_name', Value(' '), 'author__user__last_name')), Value('')),
+                    'author__user__username'
+                )
+            )
+        else:
+            queryset = queryset.select_related('author', 'author__user')
         if not self.request.user.is_staff:
             queryset = queryset.filter(status='published')
         return queryset
     
-    @action(detail=False, methods=['get'], url_path='by-slug/(?P<slug>[-\w]+)')
-    def by_slug(self, request, slug=None):
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def export(self, request):
         """
-        Récupère un article par son slug.
+        Exporte tous les articles filtrés, sans pagination, en flux JSON.
+        
+        Les lignes sont lues par paquets de 500 (iterator) : la mémoire reste
+        bornée à un paquet d'articles et à leurs catégories/tags préchargés.
+        prefetch_related n'est pris en compte par iterator() que si chunk_size
+        est fourni (Django >= 4.1).
         """
-        article = get_object_or_404(self.get_queryset(), slug=slug)
-        serializer = ArticleDetailSerializer(article)
-        return Response(serializer.data)
\ No newline at end of file
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        
+        def stream():
+            yield '['
+            for index, article in enumerate(queryset.iterator(chunk_size=500)):
+                data = serializer_class(article, context=context).data
+                yield (',' if index else '') + json.dumps(data, cls=JSONEncoder)
+            yield ']'
+        
+        return StreamingHttpResponse(stream(), content_type='application/json')
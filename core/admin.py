@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.forms import UserChangeForm
+from django.core.exceptions import ValidationError
+from django.contrib.admin.views.main import ChangeList
 from django.utils.translation import gettext_lazy as _
 
 from .models import UserProfile
@@ -26,10 +29,31 @@ class UserProfileInline(admin.StackedInline):
         }),
     )
 
+class OnlyFieldsChangeList(ChangeList):
+    """
+    Liste ne chargeant que les colonnes déclarées dans l'attribut
+    changelist_only_fields du ModelAdmin (voir CustomUserAdmin).
+    """
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        return queryset.only(*self.model_admin.changelist_only_fields)
+
+class CustomUserChangeForm(UserChangeForm):
+    """
+    Formulaire de modification vérifiant l'unicité de l'email sans tenir compte
+    de la casse (index auth_user_email_ci_uniq).
+    """
+    def clean_email(self):
+        email = self.cleaned_data.get('email', '')
+        if email and User.objects.filter(email__iexact=email).exclude(pk=self.instance.pk).exists():
+            raise ValidationError(_("Un utilisateur avec cet email existe déjà"))
+        return email
+
 class CustomUserAdmin(BaseUserAdmin):
     """
     Personnalise l'administration de l'utilisateur en ajoutant le profil inline.
     """
+    form = CustomUserChangeForm
     inlines = (UserProfileInline,)
     list_display = ('username', 'email', 'first_name', 'last_name', 'is_staff', 
                    'get_is_vendor', 'get_is_employee', 'get_language', 'get_phone')
@@ -37,11 +61,28 @@ class CustomUserAdmin(BaseUserAdmin):
                                              'profile__language', 'profile__currency')
     search_fields = BaseUserAdmin.search_fields + ('profile__phone', 'profile__address', 'profile__bio')
     
+    # Colonnes lues par list_display ; le reste de User (mot de passe, dates...)
+    # et du profil (adresse, bio...) n'est pas chargé dans la liste
+    changelist_only_fields = (
+        'id', 'username', 'email', 'first_name', 'last_name', 'is_staff',
+        'profile__is_vendor', 'profile__is_employee', 'profile__language', 'profile__phone',
+    )
+    
+    def get_changelist(self, request, **kwargs):
+        return OnlyFieldsChangeList
+    
+    def get_queryset(self, request):
+        # Le profil est chargé par jointure : les accesseurs ci-dessous ne
+        # déclenchent plus de requête par ligne (un profil absent lève toujours
+        # DoesNotExist, mais sans requête supplémentaire)
+        return super().get_queryset(request).select_related('profile')
+    
     def get_is_vendor(self, obj):
         try:
             return obj.profile.is_vendor
         except UserProfile.DoesNotExist:
             return False
+    get_is_vendor.admin_order_field = 'profile__is_vendor'
     get_is_vendor.short_description = _('Vendeur')
     get_is_vendor.boolean = True
     
@@ -50,6 +91,7 @@ class CustomUserAdmin(BaseUserAdmin):
             return obj.profile.is_employee
         except UserProfile.DoesNotExist:
             return False
+    get_is_employee.admin_order_field = 'profile__is_employee'
     get_is_employee.short_description = _('Employé')
     get_is_employee.boolean = True
     
@@ -58,6 +100,7 @@ class CustomUserAdmin(BaseUserAdmin):
             return obj.profile.get_language_display()
         except UserProfile.DoesNotExist:
             return ''
+    get_language.admin_order_field = 'profile__language'
     get_language.short_description = _('Langue')
     
     def get_phone(self, obj):
@@ -65,6 +108,7 @@ class CustomUserAdmin(BaseUserAdmin):
             return obj.profile.phone
         except UserProfile.DoesNotExist:
             return ''
+    get_phone.admin_order_field = 'profile__phone'
     get_phone.short_description = _('Téléphone')
     
     def get_inline_instances(self, request, obj=None):
@@ -78,7 +122,10 @@ class UserProfileAdmin(admin.ModelAdmin):
     """
     list_display = ('user', 'phone', 'language', 'currency', 'is_vendor', 'is_employee', 'created_at')
     list_filter = ('is_vendor', 'is_employee', 'language', 'currency', 'email_notifications', 'sms_notifications')
-    search_fields = ('user__username', 'user__email', 'phone', 'address', 'bio')
+    # Nom d'utilisateur et email cherchés par préfixe (istartswith), qui peut
+    # utiliser un index ; les autres champs gardent la recherche icontains
+    search_fields = ('^user__username', '^user__email', 'phone', 'address', 'bio')
+    list_select_related = ('user',)
     raw_id_fields = ('user',)
     readonly_fields = ('created_at', 'updated_at')
     
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        # Remplace le récepteur de last_login branché par django.contrib.auth
+        # (qui le précède dans INSTALLED_APPS) par sa version limitée
+        from django.contrib.auth.signals import user_logged_in
+        from .models import update_last_login_throttled
+
+        if user_logged_in.disconnect(dispatch_uid='update_last_login'):
+            user_logged_in.connect(update_last_login_throttled, dispatch_uid='update_last_login')
@@ -0,0 +1,30 @@
+# core/backends.py
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend qui charge le profil avec l'utilisateur lors de la connexion :
+    une seule requête avec jointure au lieu de deux (utilisateur puis profil,
+    lu par la réponse de LoginView).
+    """
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.select_related('profile').get(
+                **{UserModel.USERNAME_FIELD: username}
+            )
+        except UserModel.DoesNotExist:
+            # Hachage factice pour limiter l'écart de temps entre un utilisateur
+            # existant et un utilisateur inconnu (comme ModelBackend)
+            UserModel().set_password(password)
+        else:
+            if user.check_password(password) and self.user_can_authenticate(user):
+                return user
+        return None
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Index unique sur LOWER(email) de auth_user : l'unicité des emails,
+    insensible à la casse, est garantie par la base. Les emails vides
+    (comptes créés sans email, ex. createsuperuser) sont exclus.
+    """
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("core", "0002_userprofile_bio_userprofile_created_at_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX auth_user_email_ci_uniq ON auth_user (LOWER(email)) WHERE email <> ''",
+            reverse_sql="DROP INDEX auth_user_email_ci_uniq",
+        ),
+    ]
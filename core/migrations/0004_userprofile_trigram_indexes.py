@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:13
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+
+class PostgresOnlyMixin:
+    """
+    N'applique l'opération que sur PostgreSQL (GIN + pg_trgm) : l'état du
+    modèle est mis à jour partout, mais SQLite (développement, tests) ne crée
+    ni l'extension ni les index.
+    """
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class PostgresOnlyTrigramExtension(PostgresOnlyMixin, TrigramExtension):
+    pass
+
+
+class PostgresOnlyAddIndex(PostgresOnlyMixin, migrations.AddIndex):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_user_email_ci_unique_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        PostgresOnlyTrigramExtension(),
+        PostgresOnlyAddIndex(
+            model_name='userprofile',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('phone'), name='gin_trgm_ops'), name='core_profile_phone_trgm'),
+        ),
+        PostgresOnlyAddIndex(
+            model_name='userprofile',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('address'), name='gin_trgm_ops'), name='core_profile_address_trgm'),
+        ),
+    ]
@@ -1,7 +1,12 @@
+from datetime import timedelta
+
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 class TimeStampedModel(models.Model):
@@ -53,15 +58,39 @@ class UserProfile(TimeStampedModel):
     class Meta:
         verbose_name = _("Profil utilisateur")
         verbose_name_plural = _("Profils utilisateurs")
+        # Index trigrammes pour la recherche admin (icontains, soit
+        # UPPER(col) LIKE UPPER('%...%') sous PostgreSQL) ; requiert pg_trgm
+        indexes = [
+            GinIndex(OpClass(Upper('phone'), name='gin_trgm_ops'), name='core_profile_phone_trgm'),
+            GinIndex(OpClass(Upper('address'), name='gin_trgm_ops'), name='core_profile_address_trgm'),
+        ]
 
 
 @receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
-    """Crée ou met à jour le profil utilisateur automatiquement"""
+def create_user_profile(sender, instance, created, **kwargs):
+    """
+    Crée le profil à la création de l'utilisateur.
+    
+    Attention : User.objects.bulk_create() n'envoie pas ce signal. Les imports
+    en masse doivent créer les profils eux-mêmes, par exemple avec
+    UserProfile.objects.bulk_create([UserProfile(user=u) for u in users], ignore_conflicts=True).
+    """
     if created:
         UserProfile.objects.create(user=instance)
-    else:
-        try:
-            instance.profile.save()
-        except UserProfile.DoesNotExist:
-            UserProfile.objects.create(user=instance)
\ No newline at end of file
+
+
+# Intervalle minimal entre deux écritures de last_login pour un même utilisateur
+LAST_LOGIN_UPDATE_INTERVAL = timedelta(minutes=5)
+
+def update_last_login_throttled(sender, user, **kwargs):
+    """
+    Remplace django.contrib.auth.models.update_last_login (branché dans
+    CoreConfig.ready) : last_login n'est réécrit que s'il date de plus de
+    LAST_LOGIN_UPDATE_INTERVAL, par un UPDATE d'une seule colonne. Les
+    connexions répétées ne réécrivent donc pas la ligne auth_user à chaque fois.
+    """
+    now = timezone.now()
+    if user.last_login and now - user.last_login < LAST_LOGIN_UPDATE_INTERVAL:
+        return
+    user.last_login = now
+    User.objects.filter(pk=user.pk).update(last_login=now)
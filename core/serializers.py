@@ -2,18 +2,114 @@
 
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from django.contrib.auth.password_validation import validate_password
 from .models import UserProfile
+from rest_framework.relations import MANY_RELATION_KWARGS
 from rest_framework.validators import UniqueValidator
 from django.utils.translation import gettext_lazy as _
+import copy
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class CachedFieldsSerializerMixin:
+    """
+    Met en cache, par classe, les champs construits par get_fields().
+    
+    L'introspection du modèle (ModelSerializer) n'est faite qu'une fois ; chaque
+    instance reçoit ensuite des copies superficielles des champs, liées ensuite
+    par bind(). Les serializers imbriqués qui utilisent aussi ce mixin sont
+    copiés superficiellement (leurs propres champs viennent du cache) ; pour les
+    ListSerializer et les relations many=True, l'enfant est recopié puis
+    rattaché à la copie, pour qu'il remonte au bon parent, et donc au bon
+    contexte. Les autres champs à enfant sont copiés en profondeur.
+    """
+    _fields_cache = {}
+    
+    # Attributs calculés à la demande par une instance, jamais partagés
+    _per_instance_attrs = ('fields', '_readable_fields', '_writable_fields')
+    
+    def get_fields(self):
+        cls = type(self)
+        fields = CachedFieldsSerializerMixin._fields_cache.get(cls)
+        if fields is None:
+            fields = super().get_fields()
+            CachedFieldsSerializerMixin._fields_cache[cls] = fields
+        return {name: self._copy_field(field) for name, field in fields.items()}
+    
+    @classmethod
+    def _copy_field(cls, field):
+        if isinstance(field, serializers.ListSerializer):
+            new = cls._shallow_copy(field)
+            new.child = cls._copy_field(field.child)
+            # L'enfant est déjà lié (field_name, source) : seul le parent change
+            new.child.parent = new
+            return new
+        if isinstance(field, serializers.ManyRelatedField):
+            new = copy.copy(field)
+            new.child_relation = copy.copy(field.child_relation)
+            new.child_relation.parent = new
+            return new
+        if isinstance(field, CachedFieldsSerializerMixin):
+            return cls._shallow_copy(field)
+        if isinstance(field, serializers.BaseSerializer) or hasattr(field, 'child'):
+            return copy.deepcopy(field)
+        return copy.copy(field)
+    
+    @classmethod
+    def _shallow_copy(cls, field):
+        new = copy.copy(field)
+        for attr in cls._per_instance_attrs:
+            new.__dict__.pop(attr, None)
+        return new
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """
+    Valide une liste de clés primaires en une seule requête (pk__in) au lieu
+    d'une requête par identifiant. L'ordre des identifiants est conservé.
+    """
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pk_field = queryset.model._meta.pk
+        pks = []
+        for item in data:
+            if isinstance(item, bool):
+                child.fail('incorrect_type', data_type=type(item).__name__)
+            try:
+                pks.append(pk_field.to_python(item))
+            except Exception:
+                child.fail('incorrect_type', data_type=type(item).__name__)
+        
+        objects = queryset.in_bulk(set(pks))
+        for pk in pks:
+            if pk not in objects:
+                child.fail('does_not_exist', pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField dont la variante many=True valide tous les
+    identifiants en une requête (voir BulkManyRelatedField).
+    """
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+class UserProfileSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = UserProfile
         fields = ('phone', 'address', 'date_of_birth', 'profile_image', 'is_vendor', 'created_at')
         read_only_fields = ('created_at', 'is_vendor')
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     profile = UserProfileSerializer(required=False)
     
     class Meta:
@@ -21,10 +117,10 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'profile')
         read_only_fields = ('id',)
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     email = serializers.EmailField(
         required=True,
-        validators=[UniqueValidator(queryset=User.objects.all(), message=_("Un utilisateur avec cet email existe déjà"))]
+        validators=[UniqueValidator(queryset=User.objects.all(), lookup='iexact', message=_("Un utilisateur avec cet email existe déjà"))]
     )
     password = serializers.CharField(
         write_only=True, required=True, validators=[validate_password],
@@ -49,13 +145,11 @@ class RegisterSerializer(serializers.ModelSerializer):
         if attrs['password'] != attrs['password_confirm']:
             raise serializers.ValidationError({"password_confirm": _("Les mots de passe ne correspondent pas")})
         
-        # Vérifier que l'email n'est pas déjà utilisé
-        email = attrs.get('email', '').lower()
-        if User.objects.filter(email__iexact=email).exists():
-            raise serializers.ValidationError({"email": _("Un utilisateur avec cet email existe déjà")})
-        
+        # L'unicité de l'email (insensible à la casse) est vérifiée par le
+        # UniqueValidator du champ et garantie par l'index auth_user_email_ci_uniq
         return attrs
     
+    @transaction.atomic
     def create(self, validated_data):
         """Création de l'utilisateur avec les données validées"""
         # Extraire les données du profil
@@ -65,34 +159,42 @@ class RegisterSerializer(serializers.ModelSerializer):
         # Supprimer le champ password_confirm
         validated_data.pop('password_confirm')
         
-        # Créer l'utilisateur
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'].lower(),
-            first_name=validated_data['first_name'],
-            last_name=validated_data['last_name'],
-            password=validated_data['password']
-        )
+        # Créer l'utilisateur ; l'index unique sur LOWER(email) rejette une
+        # inscription concurrente qui aurait passé la validation en même temps
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=validated_data['username'],
+                    email=validated_data['email'].lower(),
+                    first_name=validated_data['first_name'],
+                    last_name=validated_data['last_name'],
+                    password=validated_data['password']
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({"email": _("Un utilisateur avec cet email existe déjà")})
         
-        # Mettre à jour le profil
+        # Mettre à jour le profil (créé par le signal post_save et déjà attaché
+        # à l'utilisateur) en n'écrivant que les colonnes renseignées
         if phone or address:
             profile = user.profile
             if phone:
                 profile.phone = phone
             if address:
                 profile.address = address
-            profile.save()
+            profile.save(update_fields=[
+                field for field, value in (('phone', phone), ('address', address)) if value
+            ] + ['updated_at'])
         
         return user
 
-class LoginSerializer(serializers.Serializer):
+class LoginSerializer(CachedFieldsSerializerMixin, serializers.Serializer):
     username = serializers.CharField(max_length=150, required=True)
     password = serializers.CharField(
         write_only=True, required=True,
         style={'input_type': 'password'}
     )
 
-class PasswordChangeSerializer(serializers.Serializer):
+class PasswordChangeSerializer(CachedFieldsSerializerMixin, serializers.Serializer):
     old_password = serializers.CharField(
         write_only=True, required=True,
         style={'input_type': 'password'}
@@ -114,29 +216,48 @@ class PasswordChangeSerializer(serializers.Serializer):
             )
         return attrs
 
-class PasswordResetSerializer(serializers.Serializer):
+class PasswordResetSerializer(CachedFieldsSerializerMixin, serializers.Serializer):
     email = serializers.EmailField(required=True)
 
-class UserUpdateSerializer(serializers.ModelSerializer):
+class UserUpdateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer pour la mise à jour du profil utilisateur"""
+    # Unicité insensible à la casse, comme à l'inscription (index
+    # auth_user_email_ci_uniq) ; les emails vides ne sont pas concernés
+    email = serializers.EmailField(
+        required=False, allow_blank=True, max_length=254,
+        validators=[UniqueValidator(queryset=User.objects.exclude(email=''), lookup='iexact', message=_("Un utilisateur avec cet email existe déjà"))]
+    )
     profile = UserProfileSerializer(required=False)
     
     class Meta:
         model = User
         fields = ('first_name', 'last_name', 'email', 'profile')
     
+    @transaction.atomic
     def update(self, instance, validated_data):
         """Met à jour l'utilisateur et son profil"""
         # Mettre à jour les champs de l'utilisateur
         instance.first_name = validated_data.get('first_name', instance.first_name)
         instance.last_name = validated_data.get('last_name', instance.last_name)
-        instance.email = validated_data.get('email', instance.email)
-        instance.save()
+        if 'email' in validated_data:
+            instance.email = validated_data['email'].lower()
+        
+        # L'index unique sur LOWER(email) rejette une modification concurrente
+        # qui aurait passé la validation en même temps
+        try:
+            with transaction.atomic():
+                instance.save()
+        except IntegrityError:
+            raise serializers.ValidationError({"email": _("Un utilisateur avec cet email existe déjà")})
         
         # Mettre à jour le profil s'il est fourni
         profile_data = validated_data.get('profile')
         if profile_data:
-            profile = instance.profile
+            # Les utilisateurs créés en masse peuvent ne pas avoir de profil
+            try:
+                profile = instance.profile
+            except UserProfile.DoesNotExist:
+                profile = UserProfile(user=instance)
             for attr, value in profile_data.items():
                 setattr(profile, attr, value)
             profile.save()
@@ -0,0 +1,25 @@
+# core/storage.py
+
+from boto3.s3.transfer import TransferConfig
+from storages.backends.s3boto3 import S3Boto3Storage
+
+MB = 1024 * 1024
+
+
+class B2MediaStorage(S3Boto3Storage):
+    """
+    Stockage des médias sur Backblaze B2 avec envoi multipart parallèle.
+
+    Les fichiers de moins de 8 Mo restent envoyés en un seul PUT : en dessous
+    de ce seuil, le multipart coûte plus cher qu'il ne rapporte.
+    """
+    def get_default_settings(self):
+        defaults = super().get_default_settings()
+        if defaults['transfer_config'] is None:
+            defaults['transfer_config'] = TransferConfig(
+                multipart_threshold=8 * MB,
+                multipart_chunksize=16 * MB,
+                max_concurrency=10,
+                use_threads=True,
+            )
+        return defaults
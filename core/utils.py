@@ -1,15 +1,55 @@
 # core/utils.py
 
+import csv
+
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 from django.core.exceptions import PermissionDenied
 from rest_framework.exceptions import (
     AuthenticationFailed, NotAuthenticated, ValidationError, 
     APIException, ParseError, NotFound
 )
 
+# Corps d'erreur constants, construits une fois (ne pas les modifier)
+NOT_AUTHENTICATED_BODY = {"error": "Authentification requise", "message": "Vous devez être connecté pour accéder à cette ressource"}
+NOT_FOUND_BODY = {"error": "Ressource non trouvée", "message": "La ressource demandée n'existe pas"}
+
+def _handle_validation(exc, response):
+    return Response(
+        {"error": "Données invalides", "details": response.data},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+def _handle_authentication_failed(exc, response):
+    return Response(
+        {"error": "Authentification échouée", "message": str(exc)},
+        status=status.HTTP_401_UNAUTHORIZED
+    )
+
+def _handle_not_authenticated(exc, response):
+    return Response(NOT_AUTHENTICATED_BODY, status=status.HTTP_401_UNAUTHORIZED)
+
+def _handle_not_found(exc, response):
+    return Response(NOT_FOUND_BODY, status=status.HTTP_404_NOT_FOUND)
+
+def _handle_parse_error(exc, response):
+    return Response(
+        {"error": "Format de données invalide", "message": str(exc)},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+# Formatage standard des erreurs, par classe d'exception ; une sous-classe est
+# traitée par le gestionnaire de sa classe parente la plus proche (voir __mro__)
+_EXCEPTION_HANDLERS = {
+    ValidationError: _handle_validation,
+    AuthenticationFailed: _handle_authentication_failed,
+    NotAuthenticated: _handle_not_authenticated,
+    NotFound: _handle_not_found,
+    ParseError: _handle_parse_error,
+}
+
 def custom_exception_handler(exc, context):
     """
     Gestionnaire d'exceptions personnalisé pour standardiser les réponses d'erreur.
@@ -30,32 +70,36 @@ def custom_exception_handler(exc, context):
             )
         return None
     
-    # Formatage standard des erreurs
-    if isinstance(exc, ValidationError):
-        return Response(
-            {"error": "Données invalides", "details": response.data},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    elif isinstance(exc, AuthenticationFailed):
-        return Response(
-            {"error": "Authentification échouée", "message": str(exc)},
-            status=status.HTTP_401_UNAUTHORIZED
-        )
-    elif isinstance(exc, NotAuthenticated):
-        return Response(
-            {"error": "Authentification requise", "message": "Vous devez être connecté pour accéder à cette ressource"},
-            status=status.HTTP_401_UNAUTHORIZED
-        )
-    elif isinstance(exc, NotFound):
-        return Response(
-            {"error": "Ressource non trouvée", "message": "La ressource demandée n'existe pas"},
-            status=status.HTTP_404_NOT_FOUND
-        )
-    elif isinstance(exc, ParseError):
-        return Response(
-            {"error": "Format de données invalide", "message": str(exc)},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    for cls in type(exc).__mro__:
+        handler = _EXCEPTION_HANDLERS.get(cls)
+        if handler is not None:
+            return handler(exc, response)
     
     # Pour les autres exceptions, on garde la réponse standard
-    return response
\ No newline at end of file
+    return response
+
+class Echo:
+    """
+    Pseudo-tampon pour csv.writer : write() renvoie la ligne au lieu de la
+    stocker, ce qui permet de produire le CSV ligne par ligne.
+    """
+    def write(self, value):
+        return value
+
+def streaming_csv_response(filename, header, rows):
+    """
+    Renvoie une réponse CSV produite à la volée à partir de l'itérable rows :
+    la mémoire reste constante quel que soit le nombre de lignes exportées.
+    """
+    writer = csv.writer(Echo())
+    
+    def content():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+    
+    return StreamingHttpResponse(
+        content(),
+        content_type='text/csv',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
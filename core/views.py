@@ -5,11 +5,16 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
+from django.core.cache import cache
+import jwt
+import time
 
 from .serializers import (
     RegisterSerializer, LoginSerializer, UserSerializer, 
@@ -17,6 +22,17 @@ from .serializers import (
 )
 from .models import UserProfile
 
+def issue_tokens(user):
+    """
+    Génère la paire de tokens JWT de l'utilisateur ; chaque token n'est
+    encodé (et signé) qu'une fois.
+    """
+    refresh = RefreshToken.for_user(user)
+    return {
+        "refresh": str(refresh),
+        "access": str(refresh.access_token),
+    }
+
 class RegisterView(generics.CreateAPIView):
     """
     Inscription d'un nouvel utilisateur.
@@ -32,15 +48,9 @@ class RegisterView(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
         
-        # Générer les tokens JWT
-        refresh = RefreshToken.for_user(user)
-        
         return Response({
             "user": UserSerializer(user).data,
-            "tokens": {
-                "refresh": str(refresh),
-                "access": str(refresh.access_token),
-            },
+            "tokens": issue_tokens(user),
             "message": _("Inscription réussie")
         }, status=status.HTTP_201_CREATED)
 
@@ -68,15 +78,9 @@ class LoginView(APIView):
                 "message": _("Nom d'utilisateur ou mot de passe incorrect")
             }, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Générer les tokens JWT
-        refresh = RefreshToken.for_user(user)
-        
         return Response({
             "user": UserSerializer(user).data,
-            "tokens": {
-                "refresh": str(refresh),
-                "access": str(refresh.access_token),
-            },
+            "tokens": issue_tokens(user),
             "message": _("Connexion réussie")
         })
 
@@ -95,8 +99,19 @@ class LogoutView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
+            # Un token déjà révoqué est reconnu à son jti, lu sans vérifier la
+            # signature : une déconnexion répétée ne refait pas la vérification
+            cache_key = self.blacklisted_cache_key(refresh_token)
+            if cache_key and cache.get(cache_key):
+                return Response(
+                    {"message": _("Déconnexion réussie")},
+                    status=status.HTTP_200_OK
+                )
+            
             token = RefreshToken(refresh_token)
             token.blacklist()
+            if cache_key:
+                cache.set(cache_key, 1, timeout=max(int(token['exp'] - time.time()), 1))
             
             return Response(
                 {"message": _("Déconnexion réussie")},
@@ -108,25 +123,40 @@ class LogoutView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-class UserProfileView(APIView):
+    @staticmethod
+    def blacklisted_cache_key(refresh_token):
+        try:
+            payload = jwt.decode(refresh_token, options={'verify_signature': False})
+        except jwt.InvalidTokenError:
+            return None
+        jti = payload.get(jwt_settings.JTI_CLAIM)
+        return f'core:jwt_blacklisted:{jti}' if jti else None
+
+class UserProfileView(generics.RetrieveUpdateAPIView):
     """
     Profil de l'utilisateur connecté.
     
-    Permet de consulter et mettre à jour son profil.
+    Permet de consulter (GET) et mettre à jour (PUT/PATCH, toujours partiel)
+    son profil.
     """
-    def get(self, request, *args, **kwargs):
-        """Obtenir les informations du profil de l'utilisateur connecté"""
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+    serializer_class = UserSerializer
+    
+    def get_object(self):
+        return self.request.user
+    
+    def get_serializer_class(self):
+        if self.request.method in ('PUT', 'PATCH'):
+            return UserUpdateSerializer
+        return UserSerializer
     
-    def put(self, request, *args, **kwargs):
+    def update(self, request, *args, **kwargs):
         """Mettre à jour les informations du profil de l'utilisateur connecté"""
-        serializer = UserUpdateSerializer(request.user, data=request.data, partial=True)
+        serializer = self.get_serializer(self.get_object(), data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
         
         return Response({
-            "user": UserSerializer(user).data,
+            "user": UserSerializer(user, context=self.get_serializer_context()).data,
             "message": _("Profil mis à jour avec succès")
         })
 
@@ -156,6 +186,24 @@ class PasswordChangeView(APIView):
             "message": _("Mot de passe modifié avec succès")
         })
 
+PASSWORD_RESET_DEDUP_SECONDS = 60 * 5
+
+def send_password_reset_email(email):
+    """
+    Cherche le compte associé à l'email et envoie le lien de réinitialisation.
+    
+    Ne renvoie rien : la réponse de PasswordResetView ne dépend pas du résultat.
+    Fonction autonome, à confier à une file de tâches dès que le projet en aura.
+    """
+    # Existence seule, sur LOWER(email) : la condition email <> '' permet
+    # d'utiliser l'index unique partiel auth_user_email_ci_uniq
+    user_exists = User.objects.alias(
+        email_lower=Lower('email')
+    ).filter(email_lower=email).exclude(email='').exists()
+    if user_exists:
+        # Ici, vous devriez implémenter l'envoi d'un email avec un lien de réinitialisation
+        pass
+
 class PasswordResetView(APIView):
     """
     Réinitialisation de mot de passe.
@@ -168,17 +216,14 @@ class PasswordResetView(APIView):
         serializer = PasswordResetSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        email = serializer.validated_data['email']
-        try:
-            user = User.objects.get(email=email)
-            # Ici, vous devriez implémenter l'envoi d'un email avec un lien de réinitialisation
-            # Pour l'exemple, nous allons simplement retourner un message de succès
-            
-            return Response({
-                "message": _("Un email a été envoyé avec les instructions pour réinitialiser votre mot de passe")
-            })
-        except User.DoesNotExist:
-            # Pour des raisons de sécurité, nous ne révélons pas si l'email existe ou non
-            return Response({
-                "message": _("Un email a été envoyé avec les instructions pour réinitialiser votre mot de passe")
-            })
\ No newline at end of file
+        email = serializer.validated_data['email'].lower()
+        # Une seule demande traitée par email et par tranche de 5 minutes
+        # (cache.add est atomique) : les répétitions ne touchent pas la base
+        bucket = int(time.time() // PASSWORD_RESET_DEDUP_SECONDS)
+        if cache.add(f'core:password_reset:{email}:{bucket}', 1, PASSWORD_RESET_DEDUP_SECONDS):
+            send_password_reset_email(email)
+        
+        # Pour des raisons de sécurité, nous ne révélons pas si l'email existe ou non
+        return Response({
+            "message": _("Un email a été envoyé avec les instructions pour réinitialiser votre mot de passe")
+        })
\ No newline at end of file
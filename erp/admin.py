@@ -1,12 +1,45 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Sum, Count
+from django.db.models import Sum, Count, Q
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
 from django.urls import reverse
 from django.utils import timezone
+from django.core.cache import cache
 from datetime import timedelta
 
-from .models import Department, Employee, Transaction, Asset
+from core.utils import streaming_csv_response
+from .models import Department, Employee, Transaction, Asset, financial_summary_cache_key
+
+FINANCIAL_SUMMARY_CACHE_TIMEOUT = 60 * 5
+
+# Pastilles de statut des employés : HTML constant, construit une seule fois
+NEW_BADGE = mark_safe('<span style="color: #2ecc71;">●</span> <span style="color: #2ecc71;">Nouveau</span>')
+EXPERIENCED_BADGE = mark_safe('<span style="color: #3498db;">●</span> <span style="color: #3498db;">Expérimenté</span>')
+REGULAR_BADGE = mark_safe('<span style="color: #f39c12;">●</span> <span style="color: #f39c12;">Régulier</span>')
+
+CATEGORY_COLORS = {
+    'computer': '#3498db',
+    'furniture': '#f39c12',
+    'vehicle': '#e74c3c',
+    'equipment': '#2ecc71',
+    'other': '#95a5a6'
+}
+
+# Gabarits HTML des transactions
+INCOME_COLOR = '#2ecc71'
+EXPENSE_COLOR = '#e74c3c'
+INCOME_AMOUNT_HTML = '<span style="color: #2ecc71; font-weight: bold;">+{} HTG</span>'
+EXPENSE_AMOUNT_HTML = '<span style="color: #e74c3c; font-weight: bold;">-{} HTG</span>'
+
+# Libellés de type colorés, construits à la première utilisation pour chaque
+# couple (type, langue) puis réutilisés
+_type_badges = {}
+
+# Badges de catégorie des actifs, construits à la première utilisation pour
+# chaque couple (catégorie, langue) puis réutilisés
+_category_badges = {}
 
 @admin.register(Department)
 class DepartmentAdmin(admin.ModelAdmin):
@@ -14,8 +47,9 @@ class DepartmentAdmin(admin.ModelAdmin):
     search_fields = ('name', 'description')
     
     def employee_count(self, obj):
-        return obj.employees.count()
+        return obj._employee_count
     employee_count.short_description = _("Nombre d'employés")
+    employee_count.admin_order_field = '_employee_count'
     
     def description_preview(self, obj):
         if obj.description:
@@ -26,7 +60,7 @@ class DepartmentAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
         queryset = queryset.annotate(
-            employee_count=Count('employees')
+            _employee_count=Count('employees')
         )
         return queryset
     
@@ -49,6 +83,13 @@ class EmployeeAssetInline(admin.TabularInline):
     
     def has_add_permission(self, request, obj=None):
         return False
+    
+    def get_queryset(self, request):
+        # Seules les colonnes affichées, plus les clés nécessaires au formset ;
+        # updated_at doit être chargé, sinon save() ne met pas à jour l'horodatage
+        return super().get_queryset(request).only(
+            'id', 'name', 'category', 'acquisition_date', 'value', 'responsible_id', 'updated_at'
+        )
 
 @admin.register(Employee)
 class EmployeeAdmin(admin.ModelAdmin):
@@ -63,8 +104,15 @@ class EmployeeAdmin(admin.ModelAdmin):
         return obj.user.get_full_name() or obj.user.username
     full_name.short_description = _("Nom complet")
     
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related('user', 'department')
+        queryset = queryset.annotate(
+            _asset_count=Count('assigned_assets')
+        )
+        return queryset
+    
     def asset_count(self, obj):
-        count = obj.assigned_assets.count()
+        count = obj._asset_count
         if count > 0:
             return format_html(
                 '<a href="{}?responsible__id__exact={}">{}</a>',
@@ -74,17 +122,17 @@ class EmployeeAdmin(admin.ModelAdmin):
             )
         return count
     asset_count.short_description = _("Actifs")
+    asset_count.admin_order_field = '_asset_count'
     
     def status_indicator(self, obj):
+        today = timezone.now().date()
         # Employé récent (moins de 3 mois)
-        three_months_ago = timezone.now().date() - timedelta(days=90)
-        if obj.hire_date >= three_months_ago:
-            return format_html('<span style="color: #2ecc71;">●</span> <span style="color: #2ecc71;">Nouveau</span>')
+        if obj.hire_date >= today - timedelta(days=90):
+            return NEW_BADGE
         # Employé expérimenté (plus d'un an)
-        one_year_ago = timezone.now().date() - timedelta(days=365)
-        if obj.hire_date <= one_year_ago:
-            return format_html('<span style="color: #3498db;">●</span> <span style="color: #3498db;">Expérimenté</span>')
-        return format_html('<span style="color: #f39c12;">●</span> <span style="color: #f39c12;">Régulier</span>')
+        if obj.hire_date <= today - timedelta(days=365):
+            return EXPERIENCED_BADGE
+        return REGULAR_BADGE
     status_indicator.short_description = _("Statut")
     
     fieldsets = (
@@ -107,17 +155,24 @@ class TransactionAdmin(admin.ModelAdmin):
     list_filter = ('type', 'date', 'recorded_by')
     search_fields = ('description', 'recorded_by__username')
     date_hierarchy = 'date'
+    list_select_related = ('recorded_by',)
     
     def type_colored(self, obj):
-        if obj.type == 'income':
-            return format_html('<span style="color: #2ecc71; font-weight: bold;">{}</span>', obj.get_type_display())
-        return format_html('<span style="color: #e74c3c; font-weight: bold;">{}</span>', obj.get_type_display())
+        key = (obj.type, get_language())
+        badge = _type_badges.get(key)
+        if badge is None:
+            badge = _type_badges[key] = format_html(
+                '<span style="color: {}; font-weight: bold;">{}</span>',
+                INCOME_COLOR if obj.type == 'income' else EXPENSE_COLOR,
+                Transaction.TYPE_DISPLAY.get(obj.type, obj.type)
+            )
+        return badge
     type_colored.short_description = _("Type")
     
     def amount_formatted(self, obj):
-        if obj.type == 'income':
-            return format_html('<span style="color: #2ecc71; font-weight: bold;">+{} HTG</span>', obj.amount)
-        return format_html('<span style="color: #e74c3c; font-weight: bold;">-{} HTG</span>', obj.amount)
+        # Le montant est un Decimal issu de la base : rien à échapper
+        template = INCOME_AMOUNT_HTML if obj.type == 'income' else EXPENSE_AMOUNT_HTML
+        return mark_safe(template.format(obj.amount))
     amount_formatted.short_description = _("Montant")
     
     def description_preview(self, obj):
@@ -149,17 +204,21 @@ class TransactionAdmin(admin.ModelAdmin):
         today = timezone.now().date()
         first_day_of_month = today.replace(day=1)
         
-        income_month = Transaction.objects.filter(
-            type='income', 
-            date__gte=first_day_of_month, 
-            date__lte=today
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        expense_month = Transaction.objects.filter(
-            type='expense', 
-            date__gte=first_day_of_month, 
-            date__lte=today
-        ).aggregate(total=Sum('amount'))['total'] or 0
+        # Totaux mis en cache ; les signaux de erp/models.py les invalident à
+        # chaque enregistrement ou suppression de transaction
+        cache_key = financial_summary_cache_key(today)
+        totals = cache.get(cache_key)
+        if totals is None:
+            totals = Transaction.objects.filter(
+                date__gte=first_day_of_month, 
+                date__lte=today
+            ).aggregate(
+                income=Sum('amount', filter=Q(type='income')),
+                expense=Sum('amount', filter=Q(type='expense'))
+            )
+            cache.set(cache_key, totals, FINANCIAL_SUMMARY_CACHE_TIMEOUT)
+        income_month = totals['income'] or 0
+        expense_month = totals['expense'] or 0
         
         balance_month = income_month - expense_month
         
@@ -196,26 +255,20 @@ class TransactionAdmin(admin.ModelAdmin):
     actions = ['export_csv']
     
     def export_csv(self, request, queryset):
-        import csv
-        from django.http import HttpResponse
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="transactions.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['ID', 'Type', 'Montant', 'Description', 'Date', 'Enregistré par'])
-        
-        for transaction in queryset:
-            writer.writerow([
-                transaction.id,
-                transaction.get_type_display(),
-                transaction.amount,
-                transaction.description,
-                transaction.date,
-                transaction.recorded_by.username if transaction.recorded_by else ''
-            ])
-        
-        return response
+        # Tuples bruts plutôt qu'instances ; le libellé du type est lu dans le
+        # dictionnaire des choix (traduit à l'écriture de chaque ligne)
+        type_display = Transaction.TYPE_DISPLAY
+        rows = (
+            (pk, type_display.get(type_, type_), amount, description, date, username or '')
+            for pk, type_, amount, description, date, username in queryset.values_list(
+                'id', 'type', 'amount', 'description', 'date', 'recorded_by__username'
+            ).iterator(chunk_size=5000)
+        )
+        return streaming_csv_response(
+            'transactions.csv',
+            ['ID', 'Type', 'Montant', 'Description', 'Date', 'Enregistré par'],
+            rows
+        )
     export_csv.short_description = _("Exporter les transactions sélectionnées en CSV")
 
 @admin.register(Asset)
@@ -224,21 +277,18 @@ class AssetAdmin(admin.ModelAdmin):
     list_filter = ('category', 'acquisition_date')
     search_fields = ('name', 'description', 'responsible__user__username', 'responsible__user__first_name', 'responsible__user__last_name')
     date_hierarchy = 'acquisition_date'
+    list_select_related = ('responsible__user',)
     
     def category_badge(self, obj):
-        category_colors = {
-            'computer': '#3498db',
-            'furniture': '#f39c12',
-            'vehicle': '#e74c3c',
-            'equipment': '#2ecc71',
-            'other': '#95a5a6'
-        }
-        color = category_colors.get(obj.category, '#95a5a6')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 10px;">{}</span>',
-            color,
-            obj.get_category_display()
-        )
+        key = (obj.category, get_language())
+        badge = _category_badges.get(key)
+        if badge is None:
+            badge = _category_badges[key] = format_html(
+                '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 10px;">{}</span>',
+                CATEGORY_COLORS.get(obj.category, '#95a5a6'),
+                Asset.CATEGORY_DISPLAY.get(obj.category, obj.category)
+            )
+        return badge
     category_badge.short_description = _("Catégorie")
     
     def value_formatted(self, obj):
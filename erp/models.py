@@ -1,5 +1,9 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from core.models import TimeStampedModel
 
@@ -45,6 +49,9 @@ class Employee(TimeStampedModel):
     class Meta:
         verbose_name = _("Employé")
         verbose_name_plural = _("Employés")
+        indexes = [
+            models.Index(fields=['hire_date'], name='erp_emp_hire_date_idx'),
+        ]
 
 class Transaction(TimeStampedModel):
     """
@@ -54,6 +61,8 @@ class Transaction(TimeStampedModel):
         ('income', _('Revenu')),
         ('expense', _('Dépense')),
     )
+    # Libellés indexés par code (get_type_display reconstruit ce dict à chaque appel)
+    TYPE_DISPLAY = dict(TYPE_CHOICES)
     
     type = models.CharField(_("Type"), max_length=10, choices=TYPE_CHOICES)
     amount = models.DecimalField(_("Montant"), max_digits=10, decimal_places=2)
@@ -68,11 +77,24 @@ class Transaction(TimeStampedModel):
     )
     
     def __str__(self):
-        return f"{self.get_type_display()} - {self.amount} - {self.date}"
+        return f"{self.TYPE_DISPLAY.get(self.type, self.type)} - {self.amount} - {self.date}"
     
     class Meta:
         verbose_name = _("Transaction")
         verbose_name_plural = _("Transactions")
+        indexes = [
+            models.Index(fields=['date'], name='erp_txn_date_idx'),
+            models.Index(fields=['type', 'date'], name='erp_txn_type_date_idx'),
+        ]
+
+def financial_summary_cache_key(day):
+    """Clé de cache des totaux du mois en cours, arrêtés au jour donné"""
+    return f'erp:financial_summary:{day.isoformat()}'
+
+@receiver([post_save, post_delete], sender=Transaction)
+def invalidate_financial_summary(sender, **kwargs):
+    """Invalide les totaux mis en cache par TransactionAdmin.financial_summary"""
+    cache.delete(financial_summary_cache_key(timezone.now().date()))
 
 class Asset(TimeStampedModel):
     """
@@ -85,6 +107,8 @@ class Asset(TimeStampedModel):
         ('equipment', _('Équipement')),
         ('other', _('Autre')),
     )
+    # Libellés indexés par code (get_category_display reconstruit ce dict à chaque appel)
+    CATEGORY_DISPLAY = dict(CATEGORY_CHOICES)
     
     name = models.CharField(_("Nom"), max_length=100)
     category = models.CharField(_("Catégorie"), max_length=20, choices=CATEGORY_CHOICES)
@@ -100,8 +124,12 @@ class Asset(TimeStampedModel):
     description = models.TextField(_("Description"), blank=True)
     
     def __str__(self):
-        return f"{self.name} ({self.get_category_display()})"
+        return f"{self.name} ({self.CATEGORY_DISPLAY.get(self.category, self.category)})"
     
     class Meta:
         verbose_name = _("Actif")
-        verbose_name_plural = _("Actifs")
\ No newline at end of file
+        verbose_name_plural = _("Actifs")
+        indexes = [
+            models.Index(fields=['acquisition_date'], name='erp_asset_acq_date_idx'),
+            models.Index(fields=['category'], name='erp_asset_category_idx'),
+        ]
\ No newline at end of file
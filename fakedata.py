@@ -3,366 +3,507 @@
 Script pour générer des données de test pour l'application Django
 À lancer depuis le répertoire racine du projet (où se trouve manage.py)
 
-Usage: python generate_test_data.py
+Usage: python generate_test_data.py [--settings=module.settings]
+
+Sous PostgreSQL, installer django-bulk-load (optionnel) pour charger les plus
+grosses tables via COPY au lieu de bulk_create.
 """
 
+import logging
+import logging.handlers
 import os
 import sys
 import django
 from django.conf import settings
+from django.db import connection, transaction
+from django.contrib.auth.hashers import make_password
 from django.utils.text import slugify
 from decimal import Decimal
 import random
-from datetime import datetime, timedelta
+from collections import defaultdict
+from functools import lru_cache
 from django.utils import timezone
 
 # Configuration Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'afepanou.settings')  # Remplacez par votre module settings
+for arg in sys.argv[1:]:
+    if arg.startswith('--settings='):
+        os.environ['DJANGO_SETTINGS_MODULE'] = arg.split('=', 1)[1]
 django.setup()
 
 # Imports des modèles après setup Django
 from django.contrib.auth.models import User
+from core.models import UserProfile
 from marketplace.models import (  # Remplacez 'stores' par le nom de votre app
     Store, ProductCategory, ProductTag, Product, 
     ProductImage, Address, Order, OrderItem
 )
 
+try:
+    from django_bulk_load import bulk_insert_models
+except ImportError:
+    bulk_insert_models = None
+
+logger = logging.getLogger(__name__)
+
+# Graine par défaut : les mêmes données à chaque exécution
+DEFAULT_SEED = 42
+
+# Taille des lots pour les INSERT multi-lignes de bulk_create
+BATCH_SIZE = 1000
+
+
+def bulk_insert(model, objs):
+    """
+    Insère objs en masse et renvoie les instances avec leur pk.
+    
+    Utilise COPY (django-bulk-load) sous PostgreSQL quand le paquet est
+    installé, bulk_create sinon. Attention : avec COPY, les instances
+    renvoyées sont de nouveaux objets, dans un ordre quelconque.
+    """
+    if objs and bulk_insert_models is not None and connection.vendor == 'postgresql':
+        return bulk_insert_models(objs, return_models=True)
+    return model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+
+
+@lru_cache(maxsize=None)
+def product_description(name):
+    """Description HTML d'un produit, partagée par tous les produits de même nom"""
+    return f"<p>Description détaillée du produit {name}. Excellent produit de qualité supérieure.</p>"
+
+
 class DataGenerator:
-    def __init__(self):
+    # Données de test : tuples de classe, construits une seule fois
+    store_names = (
+        'Boutique Élégance', 'TechShop Haiti', 'Mode Créole', 
+        'Artisanat Local', 'Épicerie Moderne', 'Formation Plus',
+        'Services Pro', 'Beauté Tropicale', 'Librairie Soleil',
+        'Électronique Caraïbe'
+    )
+    
+    category_data = (
+        ('Électronique', 'Produits électroniques et high-tech'),
+        ('Vêtements', 'Mode et accessoires'),
+        ('Alimentation', 'Produits alimentaires'),
+        ('Beauté', 'Cosmétiques et soins'),
+        ('Maison', 'Articles pour la maison'),
+        ('Formation', 'Cours et formations'),
+        ('Services', 'Services professionnels'),
+        ('Artisanat', 'Produits artisanaux locaux'),
+        ('Livres', 'Livres et publications'),
+        ('Sport', 'Articles de sport'),
+    )
+    
+    subcategory_data = {
+        'Électronique': ('Smartphones', 'Ordinateurs', 'Accessoires'),
+        'Vêtements': ('Homme', 'Femme', 'Enfant', 'Chaussures'),
+        'Alimentation': ('Fruits', 'Légumes', 'Épices', 'Boissons'),
+        'Beauté': ('Soins visage', 'Maquillage', 'Parfums'),
+        'Maison': ('Décoration', 'Cuisine', 'Jardin'),
+    }
+    
+    tag_names = (
+        'Nouveau', 'Populaire', 'Promo', 'Local', 'Bio', 
+        'Handmade', 'Premium', 'Éco-friendly', 'Tendance', 'Unique'
+    )
+    
+    product_names = {
+        'physical': (
+            'iPhone 14 Pro', 'MacBook Air', 'Robe créole traditionnelle',
+            'Café haïtien premium', 'Masque à l\'argile', 'Sculpture en bois',
+            'Livre d\'histoire d\'Haïti', 'Chaussures en cuir', 'Épices locales',
+            'Sac à main artisanal', 'Bijoux créoles', 'Peinture locale'
+        ),
+        'service': (
+            'Consultation marketing', 'Service de livraison', 'Réparation électronique',
+            'Coiffure à domicile', 'Nettoyage professionnel', 'Traduction',
+            'Service comptable', 'Consultation juridique'
+        ),
+        'training': (
+            'Formation en informatique', 'Cours de créole', 'Atelier de cuisine',
+            'Formation entrepreneuriat', 'Cours de français', 'Atelier artisanat',
+            'Formation marketing digital', 'Cours de musique'
+        )
+    }
+    
+    haitian_cities = (
+        'Port-au-Prince', 'Cap-Haïtien', 'Gonaïves', 'Les Cayes',
+        'Jacmel', 'Jérémie', 'Fort-Liberté', 'Hinche', 'Petit-Goâve',
+        'Saint-Marc', 'Léogâne', 'Croix-des-Bouquets'
+    )
+    
+    haitian_departments = (
+        'Ouest', 'Nord', 'Artibonite', 'Sud', 'Sud-Est',
+        'Grande-Anse', 'Nord-Est', 'Centre', 'Nippes', 'Nord-Ouest'
+    )
+    
+    first_names = ('Jean', 'Marie', 'Pierre', 'Anne', 'Jacques', 'Claudette',
+                   'Michel', 'Rose', 'Paul', 'Joséphine', 'François', 'Micheline')
+    last_names = ('Dupont', 'Martin', 'Bernard', 'Durand', 'Moreau', 'Simon',
+                  'Laurent', 'Lefebvre', 'Roux', 'Fournier', 'Girard', 'Bonnet')
+
+    def __init__(self, seed=DEFAULT_SEED):
+        # Générateur dédié et graine fixe : jeu de données reproductible
+        self.rng = random.Random(seed)
+        # Horodatage de référence, lu une seule fois pour toute l'exécution
+        self._now = timezone.now()
         self.users = []
         self.stores = []
         self.categories = []
         self.tags = []
         self.products = []
         self.addresses = []
+        self.addresses_by_user = defaultdict(list)
         self.orders = []
-        
-        # Données de test
-        self.store_names = [
-            'Boutique Élégance', 'TechShop Haiti', 'Mode Créole', 
-            'Artisanat Local', 'Épicerie Moderne', 'Formation Plus',
-            'Services Pro', 'Beauté Tropicale', 'Librairie Soleil',
-            'Électronique Caraïbe'
-        ]
-        
-        self.category_data = [
-            ('Électronique', 'Produits électroniques et high-tech'),
-            ('Vêtements', 'Mode et accessoires'),
-            ('Alimentation', 'Produits alimentaires'),
-            ('Beauté', 'Cosmétiques et soins'),
-            ('Maison', 'Articles pour la maison'),
-            ('Formation', 'Cours et formations'),
-            ('Services', 'Services professionnels'),
-            ('Artisanat', 'Produits artisanaux locaux'),
-            ('Livres', 'Livres et publications'),
-            ('Sport', 'Articles de sport'),
-        ]
-        
-        self.subcategory_data = {
-            'Électronique': ['Smartphones', 'Ordinateurs', 'Accessoires'],
-            'Vêtements': ['Homme', 'Femme', 'Enfant', 'Chaussures'],
-            'Alimentation': ['Fruits', 'Légumes', 'Épices', 'Boissons'],
-            'Beauté': ['Soins visage', 'Maquillage', 'Parfums'],
-            'Maison': ['Décoration', 'Cuisine', 'Jardin'],
-        }
-        
-        self.tag_names = [
-            'Nouveau', 'Populaire', 'Promo', 'Local', 'Bio', 
-            'Handmade', 'Premium', 'Éco-friendly', 'Tendance', 'Unique'
-        ]
-        
-        self.product_names = {
-            'physical': [
-                'iPhone 14 Pro', 'MacBook Air', 'Robe créole traditionnelle',
-                'Café haïtien premium', 'Masque à l\'argile', 'Sculpture en bois',
-                'Livre d\'histoire d\'Haïti', 'Chaussures en cuir', 'Épices locales',
-                'Sac à main artisanal', 'Bijoux créoles', 'Peinture locale'
-            ],
-            'service': [
-                'Consultation marketing', 'Service de livraison', 'Réparation électronique',
-                'Coiffure à domicile', 'Nettoyage professionnel', 'Traduction',
-                'Service comptable', 'Consultation juridique'
-            ],
-            'training': [
-                'Formation en informatique', 'Cours de créole', 'Atelier de cuisine',
-                'Formation entrepreneuriat', 'Cours de français', 'Atelier artisanat',
-                'Formation marketing digital', 'Cours de musique'
-            ]
-        }
-        
-        self.haitian_cities = [
-            'Port-au-Prince', 'Cap-Haïtien', 'Gonaïves', 'Les Cayes',
-            'Jacmel', 'Jérémie', 'Fort-Liberté', 'Hinche', 'Petit-Goâve',
-            'Saint-Marc', 'Léogâne', 'Croix-des-Bouquets'
-        ]
-        
-        self.haitian_departments = [
-            'Ouest', 'Nord', 'Artibonite', 'Sud', 'Sud-Est',
-            'Grande-Anse', 'Nord-Est', 'Centre', 'Nippes', 'Nord-Ouest'
-        ]
+
+    def random_amount(self, low, high):
+        """Montant aléatoire en centimes entiers, sous forme de Decimal à 2 décimales"""
+        return Decimal(self.rng.randint(low * 100, high * 100)).scaleb(-2)
 
     def generate_users(self, count=20):
         """Génère des utilisateurs"""
-        print(f"Génération de {count} utilisateurs...")
-        
-        first_names = ['Jean', 'Marie', 'Pierre', 'Anne', 'Jacques', 'Claudette', 
-                      'Michel', 'Rose', 'Paul', 'Joséphine', 'François', 'Micheline']
-        last_names = ['Dupont', 'Martin', 'Bernard', 'Durand', 'Moreau', 'Simon',
-                     'Laurent', 'Lefebvre', 'Roux', 'Fournier', 'Girard', 'Bonnet']
+        logger.info("Génération de %d utilisateurs...", count)
         
-        for i in range(count):
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
+        # Un seul hachage (Argon2, le hacheur par défaut) partagé par tous les comptes de test
+        password = make_password('password123')
+        users = []
+        name_picks = zip(
+            self.rng.choices(self.first_names, k=count),
+            self.rng.choices(self.last_names, k=count)
+        )
+        for i, (first_name, last_name) in enumerate(name_picks):
             username = f"{first_name.lower()}.{last_name.lower()}{i}"
-            email = f"{username}@example.com"
-            
-            user = User.objects.create_user(
+            users.append(User(
                 username=username,
-                email=email,
-                password='password123',
+                email=f"{username}@example.com",
+                password=password,
                 first_name=first_name,
                 last_name=last_name
-            )
-            self.users.append(user)
+            ))
+        # Les usernames déjà présents sont ignorés par la base plutôt que vérifiés
+        # un à un ; ignore_conflicts ne renvoie pas les pk, d'où la relecture
+        User.objects.bulk_create(users, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        self.users = list(User.objects.filter(
+            username__in=[user.username for user in users]
+        ).order_by('pk'))
+        
+        # bulk_create n'envoie pas post_save : on crée les profils nous-mêmes
+        UserProfile.objects.bulk_create(
+            [UserProfile(user=user) for user in self.users],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True
+        )
         
-        print(f"✓ {count} utilisateurs créés")
+        logger.info("✓ %d utilisateurs créés", count)
 
     def generate_stores(self, count=10):
         """Génère des boutiques"""
-        print(f"Génération de {count} boutiques...")
+        logger.info("Génération de %d boutiques...", count)
         
-        for i in range(min(count, len(self.store_names))):
-            store_name = self.store_names[i]
-            owner = random.choice(self.users)
-            
-            store = Store.objects.create(
+        # bulk_create n'appelle pas save() : le slug est renseigné ici
+        store_names = self.store_names[:count]
+        owners = self.rng.choices(self.users, k=len(store_names))
+        stores = [
+            Store(
                 name=store_name,
+                slug=slugify(store_name),
                 owner=owner,
                 description=f"<p>Description de la boutique {store_name}. Nous offrons des produits de qualité avec un service client exceptionnel.</p>",
                 is_active=True
             )
-            self.stores.append(store)
+            for store_name, owner in zip(store_names, owners)
+        ]
+        self.stores = Store.objects.bulk_create(stores, batch_size=BATCH_SIZE)
         
-        print(f"✓ {len(self.stores)} boutiques créées")
+        logger.info("✓ %d boutiques créées", len(self.stores))
 
     def generate_categories(self):
         """Génère des catégories de produits"""
-        print("Génération des catégories...")
+        logger.info("Génération des catégories...")
         
         # Catégories principales
-        for name, description in self.category_data:
-            category = ProductCategory.objects.create(
-                name=name,
-                description=description
-            )
-            self.categories.append(category)
+        parents = ProductCategory.objects.bulk_create(
+            [
+                ProductCategory(name=name, slug=slugify(name), description=description)
+                for name, description in self.category_data
+            ],
+            batch_size=BATCH_SIZE
+        )
         
-        # Sous-catégories
-        for parent_name, subcats in self.subcategory_data.items():
-            try:
-                parent = ProductCategory.objects.get(name=parent_name)
-                for subcat_name in subcats:
-                    subcat = ProductCategory.objects.create(
-                        name=subcat_name,
-                        description=f"Sous-catégorie de {parent_name}",
-                        parent=parent
-                    )
-                    self.categories.append(subcat)
-            except ProductCategory.DoesNotExist:
-                continue
+        # Sous-catégories, rattachées via les parents gardés en mémoire
+        parents_by_name = {category.name: category for category in parents}
+        subcategories = [
+            ProductCategory(
+                name=subcat_name,
+                slug=slugify(subcat_name),
+                description=f"Sous-catégorie de {parent_name}",
+                parent=parents_by_name[parent_name]
+            )
+            for parent_name, subcats in self.subcategory_data.items()
+            for subcat_name in subcats
+        ]
+        self.categories = parents + ProductCategory.objects.bulk_create(
+            subcategories, batch_size=BATCH_SIZE
+        )
         
-        print(f"✓ {len(self.categories)} catégories créées")
+        logger.info("✓ %d catégories créées", len(self.categories))
 
     def generate_tags(self):
         """Génère des tags"""
-        print("Génération des tags...")
+        logger.info("Génération des tags...")
         
-        for tag_name in self.tag_names:
-            tag = ProductTag.objects.create(name=tag_name)
-            self.tags.append(tag)
+        self.tags = ProductTag.objects.bulk_create(
+            [ProductTag(name=tag_name, slug=slugify(tag_name)) for tag_name in self.tag_names],
+            batch_size=BATCH_SIZE
+        )
         
-        print(f"✓ {len(self.tags)} tags créés")
+        logger.info("✓ %d tags créés", len(self.tags))
 
     def generate_products(self, count=50):
         """Génère des produits"""
-        print(f"Génération de {count} produits...")
+        logger.info("Génération de %d produits...", count)
         
         product_types = ['physical', 'service', 'training']
         currencies = ['HTG', 'USD']
         statuses = ['available', 'out_of_stock', 'discontinued']
         
+        # Tirages faits en une fois pour tout le lot
+        type_picks = self.rng.choices(product_types, k=count)
+        store_picks = self.rng.choices(self.stores, k=count)
+        currency_picks = self.rng.choices(currencies, k=count)
+        
+        products = []
         for i in range(count):
-            product_type = random.choice(product_types)
+            product_type = type_picks[i]
             product_names = self.product_names[product_type]
             
             if not product_names:
                 continue
                 
-            name = random.choice(product_names)
-            store = random.choice(self.stores)
+            name = self.rng.choice(product_names)
+            store = store_picks[i]
             
             # Prix basé sur le type de produit
             if product_type == 'physical':
-                price = Decimal(str(random.uniform(10, 1000)))
-                stock_quantity = random.randint(0, 100) if random.random() > 0.1 else 0
+                price = self.random_amount(10, 1000)
+                stock_quantity = self.rng.randint(0, 100) if self.rng.random() > 0.1 else 0
             elif product_type == 'service':
-                price = Decimal(str(random.uniform(50, 500)))
+                price = self.random_amount(50, 500)
                 stock_quantity = None
             else:  # training
-                price = Decimal(str(random.uniform(100, 2000)))
-                stock_quantity = random.randint(1, 20)
+                price = self.random_amount(100, 2000)
+                stock_quantity = self.rng.randint(1, 20)
             
             # Statut basé sur le stock
             if stock_quantity == 0:
                 status = 'out_of_stock'
-            elif random.random() > 0.95:
+            elif self.rng.random() > 0.95:
                 status = 'discontinued'
             else:
                 status = 'available'
             
-            product = Product.objects.create(
-                name=f"{name} #{i+1}",
+            product_name = f"{name} #{i+1}"
+            products.append(Product(
+                name=product_name,
+                slug=slugify(product_name),
                 store=store,
                 product_type=product_type,
-                description=f"<p>Description détaillée du produit {name}. Excellent produit de qualité supérieure.</p>",
+                description=product_description(name),
                 price=price,
-                currency=random.choice(currencies),
+                currency=currency_picks[i],
                 status=status,
                 stock_quantity=stock_quantity,
-                duration=f"{random.randint(1, 10)} heures" if product_type in ['service', 'training'] else "",
+                duration=f"{self.rng.randint(1, 10)} heures" if product_type in ['service', 'training'] else "",
                 format="En ligne" if product_type == 'training' else ""
-            )
-            
+            ))
+        
+        self.products = bulk_insert(Product, products)
+        
+        # Lignes des tables de liaison, insérées en une fois par relation
+        ProductCategories = Product.categories.through
+        ProductTags = Product.tags.through
+        product_categories = []
+        product_tags = []
+        for product in self.products:
             # Associer des catégories (1-3 par produit)
-            categories_to_add = random.sample(self.categories, random.randint(1, min(3, len(self.categories))))
-            product.categories.set(categories_to_add)
+            categories_to_add = self.rng.sample(self.categories, self.rng.randint(1, min(3, len(self.categories))))
+            product_categories.extend(
+                ProductCategories(product_id=product.pk, productcategory_id=category.pk)
+                for category in categories_to_add
+            )
             
             # Associer des tags (0-4 par produit)
-            tags_to_add = random.sample(self.tags, random.randint(0, min(4, len(self.tags))))
-            product.tags.set(tags_to_add)
-            
-            self.products.append(product)
+            tags_to_add = self.rng.sample(self.tags, self.rng.randint(0, min(4, len(self.tags))))
+            product_tags.extend(
+                ProductTags(product_id=product.pk, producttag_id=tag.pk)
+                for tag in tags_to_add
+            )
+        
+        ProductCategories.objects.bulk_create(product_categories, batch_size=BATCH_SIZE)
+        ProductTags.objects.bulk_create(product_tags, batch_size=BATCH_SIZE)
         
-        print(f"✓ {len(self.products)} produits créés")
+        logger.info("✓ %d produits créés", len(self.products))
 
     def generate_addresses(self, count=30):
         """Génère des adresses"""
-        print(f"Génération de {count} adresses...")
+        logger.info("Génération de %d adresses...", count)
         
-        for i in range(count):
-            user = random.choice(self.users)
-            city = random.choice(self.haitian_cities)
-            department = random.choice(self.haitian_departments)
-            
-            address = Address.objects.create(
+        addresses = []
+        picks = zip(
+            self.rng.choices(self.users, k=count),
+            self.rng.choices(self.haitian_cities, k=count),
+            self.rng.choices(self.haitian_departments, k=count)
+        )
+        for user, city, department in picks:
+            addresses.append(Address(
                 user=user,
                 name=f"{user.first_name} {user.last_name}",
-                address_line1=f"{random.randint(1, 999)} Rue {random.randint(1, 50)}",
-                address_line2=f"Apt {random.randint(1, 20)}" if random.random() > 0.7 else "",
+                address_line1=f"{self.rng.randint(1, 999)} Rue {self.rng.randint(1, 50)}",
+                address_line2=f"Apt {self.rng.randint(1, 20)}" if self.rng.random() > 0.7 else "",
                 city=city,
                 state=department,
-                phone=f"+509 {random.randint(10000000, 99999999)}",
-                is_default=random.random() > 0.7
-            )
-            self.addresses.append(address)
+                phone=f"+509 {self.rng.randint(10000000, 99999999)}",
+                is_default=self.rng.random() > 0.7
+            ))
+        
+        self.addresses = bulk_insert(Address, addresses)
+        for address in self.addresses:
+            self.addresses_by_user[address.user_id].append(address)
         
-        print(f"✓ {len(self.addresses)} adresses créées")
+        logger.info("✓ %d adresses créées", len(self.addresses))
 
     def generate_orders(self, count=25):
         """Génère des commandes"""
-        print(f"Génération de {count} commandes...")
+        logger.info("Génération de %d commandes...", count)
         
         statuses = ['pending', 'paid', 'processing', 'shipped', 'delivered', 'cancelled']
         
+        # Articles de toutes les commandes, insérés en une fois à la fin
+        order_items = []
+        customer_picks = self.rng.choices(self.users, k=count)
+        status_picks = self.rng.choices(statuses, k=count)
+        year = self._now.year
+        # Les statuts ne changent pas pendant la génération : filtrés une seule fois
+        available_products = [p for p in self.products if p.status == 'available']
         for i in range(count):
-            customer = random.choice(self.users)
-            customer_addresses = [addr for addr in self.addresses if addr.user == customer]
+            customer = customer_picks[i]
+            customer_addresses = self.addresses_by_user[customer.pk]
             
             if not customer_addresses:
                 # Créer une adresse pour ce client
                 address = Address.objects.create(
                     user=customer,
                     name=f"{customer.first_name} {customer.last_name}",
-                    address_line1=f"{random.randint(1, 999)} Rue principale",
-                    city=random.choice(self.haitian_cities),
-                    state=random.choice(self.haitian_departments),
-                    phone=f"+509 {random.randint(10000000, 99999999)}",
+                    address_line1=f"{self.rng.randint(1, 999)} Rue principale",
+                    city=self.rng.choice(self.haitian_cities),
+                    state=self.rng.choice(self.haitian_departments),
+                    phone=f"+509 {self.rng.randint(10000000, 99999999)}",
                     is_default=True
                 )
-                customer_addresses = [address]
+                customer_addresses.append(address)
             
-            shipping_address = random.choice(customer_addresses)
+            shipping_address = self.rng.choice(customer_addresses)
             
-            order = Order.objects.create(
+            order = Order(
                 customer=customer,
-                order_number=f"ORD-{datetime.now().year}-{str(i+1).zfill(4)}",
-                status=random.choice(statuses),
+                order_number=f"ORD-{year}-{i+1:04d}",
+                status=status_picks[i],
                 shipping_address=shipping_address,
-                total_amount=Decimal('0'),  # Sera calculé après ajout des items
-                shipping_cost=Decimal(str(random.uniform(5, 50))),
-                notes=f"Commande #{i+1} - Notes spéciales" if random.random() > 0.7 else ""
+                total_amount=Decimal('0'),  # Sera calculé avec les items
+                shipping_cost=self.random_amount(5, 50),
+                notes=f"Commande #{i+1} - Notes spéciales" if self.rng.random() > 0.7 else ""
             )
             
             # Ajouter des items à la commande (1-5 produits)
-            available_products = [p for p in self.products if p.status == 'available']
             if available_products:
-                num_items = random.randint(1, min(5, len(available_products)))
-                selected_products = random.sample(available_products, num_items)
+                num_items = self.rng.randint(1, min(5, len(available_products)))
+                selected_products = self.rng.sample(available_products, num_items)
                 
                 total_amount = Decimal('0')
                 
                 for product in selected_products:
-                    quantity = random.randint(1, 3)
+                    quantity = self.rng.randint(1, 3)
                     price = product.price
                     
-                    OrderItem.objects.create(
+                    order_items.append(OrderItem(
                         order=order,
                         product=product,
                         quantity=quantity,
                         price=price
-                    )
+                    ))
                     
                     total_amount += price * quantity
                 
-                # Mettre à jour le montant total
+                # Montant total calculé en mémoire, avant l'insertion
                 order.total_amount = total_amount + order.shipping_cost
-                order.save()
             
             self.orders.append(order)
         
-        print(f"✓ {len(self.orders)} commandes créées")
+        # Les commandes reçoivent leur pk ici ; les items sont rattachés aux
+        # instances insérées par numéro de commande (COPY renvoie des copies)
+        self.orders = bulk_insert(Order, self.orders)
+        orders_by_number = {order.order_number: order for order in self.orders}
+        for item in order_items:
+            item.order = orders_by_number[item.order.order_number]
+        bulk_insert(OrderItem, order_items)
+        
+        logger.info("✓ %d commandes créées", len(self.orders))
+
+    def tune_sqlite(self):
+        """Désactive la durabilité de SQLite : les données de test sont jetables"""
+        # Hors transaction : journal_mode ne peut pas changer dans une transaction
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous=OFF')
+            cursor.execute('PRAGMA journal_mode=MEMORY')
+            cursor.execute('PRAGMA temp_store=MEMORY')
 
     def run(self):
         """Exécute la génération complète des données"""
-        print("🚀 Début de la génération des données de test...")
-        print("-" * 50)
+        logger.info("🚀 Début de la génération des données de test...")
+        logger.info("-" * 50)
+        
+        if connection.vendor == 'sqlite':
+            self.tune_sqlite()
         
         try:
-            # Générer dans l'ordre des dépendances
-            self.generate_users(20)
-            self.generate_stores(10)
-            self.generate_categories()
-            self.generate_tags()
-            self.generate_products(50)
-            self.generate_addresses(30)
-            self.generate_orders(25)
+            # Une seule transaction : un seul commit, et rien n'est gardé en cas d'erreur.
+            # Inutile de désactiver AUTOCOMMIT : le script garde une seule connexion
+            # ouverte du début à la fin, et atomic() fixe déjà le point de commit.
+            with transaction.atomic():
+                # Générer dans l'ordre des dépendances
+                self.generate_users(20)
+                self.generate_stores(10)
+                self.generate_categories()
+                self.generate_tags()
+                self.generate_products(50)
+                self.generate_addresses(30)
+                self.generate_orders(25)
             
-            print("-" * 50)
-            print("✅ Génération terminée avec succès!")
-            print(f"📊 Résumé:")
-            print(f"   - Utilisateurs: {len(self.users)}")
-            print(f"   - Boutiques: {len(self.stores)}")
-            print(f"   - Catégories: {len(self.categories)}")
-            print(f"   - Tags: {len(self.tags)}")
-            print(f"   - Produits: {len(self.products)}")
-            print(f"   - Adresses: {len(self.addresses)}")
-            print(f"   - Commandes: {len(self.orders)}")
+            logger.info("-" * 50)
+            logger.info("✅ Génération terminée avec succès!")
+            logger.info("📊 Résumé:")
+            logger.info("   - Utilisateurs: %d", len(self.users))
+            logger.info("   - Boutiques: %d", len(self.stores))
+            logger.info("   - Catégories: %d", len(self.categories))
+            logger.info("   - Tags: %d", len(self.tags))
+            logger.info("   - Produits: %d", len(self.products))
+            logger.info("   - Adresses: %d", len(self.addresses))
+            logger.info("   - Commandes: %d", len(self.orders))
             
         except Exception as e:
-            print(f"❌ Erreur lors de la génération: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Erreur lors de la génération: %s", e)
+        finally:
+            # Vide le tampon des messages en une seule écriture
+            for handler in logger.handlers:
+                handler.flush()
 
 if __name__ == "__main__":
+    # Messages mis en tampon et écrits d'un bloc (immédiatement en cas d'erreur)
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.handlers.MemoryHandler(
+        capacity=100,
+        flushLevel=logging.ERROR,
+        target=logging.StreamHandler(sys.stdout)
+    ))
     generator = DataGenerator()
     generator.run()
\ No newline at end of file
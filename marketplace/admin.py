@@ -1,19 +1,67 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from django.utils.html import format_html
-from django.db.models import Sum, Count, F, DecimalField
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+from django.db.models import Sum, Count, F, DecimalField, OuterRef, Subquery, Case, When, Value, BooleanField
 from django.db.models.functions import Coalesce
 from django.urls import reverse, path
 from django.http import HttpResponse
 from django.utils import timezone
-import csv
+from django.core.cache import cache
+from django.template.loader import render_to_string
 import json
 from datetime import timedelta
 
 from .models import (
     Store, ProductCategory, ProductTag, Product, ProductImage,
-    Address, Order, OrderItem
+    Address, Order, OrderItem, STORE_CHOICES_CACHE_KEY
 )
+from payments.models import PaymentTransaction
+from core.admin import OnlyFieldsChangeList
+from core.utils import streaming_csv_response
+
+# Pastilles constantes, construites une seule fois
+ACTIVE_BADGE = mark_safe('<span style="color: #2ecc71;">●</span> <span>Actif</span>')
+INACTIVE_BADGE = mark_safe('<span style="color: #e74c3c;">●</span> <span>Inactif</span>')
+NO_PAYMENT_BADGE = mark_safe('<span style="color: #95a5a6; font-weight: bold;">Pas de paiement</span>')
+PAYMENT_BADGES = {
+    'success': mark_safe('<span style="color: #2ecc71; font-weight: bold;">✓ Payé</span>'),
+    'pending': mark_safe('<span style="color: #f39c12; font-weight: bold;">⏳ En attente</span>'),
+    'failed': mark_safe('<span style="color: #e74c3c; font-weight: bold;">✗ Échec</span>'),
+}
+UNKNOWN_PAYMENT_BADGE = mark_safe('<span style="color: #95a5a6; font-weight: bold;">? Statut inconnu</span>')
+
+PRODUCT_TYPE_COLORS = {
+    'physical': '#3498db',
+    'service': '#2ecc71',
+    'training': '#f39c12'
+}
+PRODUCT_STATUS_COLORS = {
+    'available': '#2ecc71',
+    'out_of_stock': '#e74c3c',
+    'discontinued': '#95a5a6'
+}
+ORDER_STATUS_COLORS = {
+    'pending': '#f39c12',
+    'paid': '#3498db',
+    'processing': '#9b59b6',
+    'shipped': '#2ecc71',
+    'delivered': '#27ae60',
+    'cancelled': '#e74c3c'
+}
+BADGE_HTML = '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 10px;">{}</span>'
+
+# Badges colorés, construits à la première utilisation pour chaque
+# (champ, code, langue) puis réutilisés
+_badges = {}
+
+def _badge(field, code, colors, labels):
+    key = (field, code, get_language())
+    badge = _badges.get(key)
+    if badge is None:
+        badge = _badges[key] = format_html(BADGE_HTML, colors.get(code, '#95a5a6'), labels.get(code, code))
+    return badge
 
 # Inlines
 class ProductImageInline(admin.TabularInline):
@@ -36,9 +84,14 @@ class OrderItemInline(admin.TabularInline):
     
     def subtotal(self, obj):
         if obj.pk:
-            return f"{obj.price * obj.quantity} {obj.product.get_currency_display()}"
+            currency = obj.product.currency
+            return f"{obj.price * obj.quantity} {Product.CURRENCY_DISPLAY.get(currency, currency)}"
         return "-"
     subtotal.short_description = _("Sous-total")
+    
+    def get_queryset(self, request):
+        # Produit joint : subtotal lit sa devise sans requête par ligne
+        return super().get_queryset(request).select_related('product')
 
 # Filters personnalisés
 class ProductTypeFilter(admin.SimpleListFilter):
@@ -58,7 +111,14 @@ class StoreFilter(admin.SimpleListFilter):
     parameter_name = 'store'
     
     def lookups(self, request, model_admin):
-        return [(store.id, store.name) for store in Store.objects.all()]
+        # Seules les deux colonnes utiles, sans construire d'objets Store ;
+        # les signaux de marketplace/models.py invalident le cache, l'expiration
+        # couvre les modifications qui ne passent pas par eux (update(), SQL)
+        return cache.get_or_set(
+            STORE_CHOICES_CACHE_KEY,
+            lambda: list(Store.objects.order_by('name').values_list('id', 'name')),
+            300
+        )
     
     def queryset(self, request, queryset):
         if self.value():
@@ -90,6 +150,10 @@ class PriceRangeFilter(admin.SimpleListFilter):
 class StoreAdmin(admin.ModelAdmin):
     list_display = ('name', 'owner', 'product_count', 'active_status', 'display_logo', 'created_at')
     list_filter = ('is_active', 'created_at')
+    list_select_related = ('owner',)
+    # Colonnes lues par list_display ; description et bannière ne sont pas
+    # chargées dans la liste
+    changelist_only_fields = ('id', 'name', 'owner__id', 'owner__username', 'is_active', 'logo', 'created_at')
     search_fields = ('name', 'description', 'owner__username', 'owner__first_name', 'owner__last_name')
     prepopulated_fields = {'slug': ('name',)}
     readonly_fields = ('created_at', 'updated_at', 'display_banner', 'display_logo', 'store_preview')
@@ -114,14 +178,16 @@ class StoreAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_changelist(self, request, **kwargs):
+        return OnlyFieldsChangeList
+    
     def active_status(self, obj):
-        if obj.is_active:
-            return format_html('<span style="color: #2ecc71;">●</span> <span>Actif</span>')
-        return format_html('<span style="color: #e74c3c;">●</span> <span>Inactif</span>')
+        return ACTIVE_BADGE if obj.is_active else INACTIVE_BADGE
     active_status.short_description = _("Statut")
     
     def product_count(self, obj):
-        count = obj.products.count()
+        # Annotation de get_queryset : pas de COUNT par ligne
+        count = obj.product_count
         if count > 0:
             return format_html(
                 '<a href="{}?store__id__exact={}">{}</a>',
@@ -131,6 +197,7 @@ class StoreAdmin(admin.ModelAdmin):
             )
         return count
     product_count.short_description = _("Produits")
+    product_count.admin_order_field = 'product_count'
     
     def display_logo(self, obj):
         if obj.logo:
@@ -202,11 +269,13 @@ class StoreAdmin(admin.ModelAdmin):
 class ProductCategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'parent', 'product_count', 'slug')
     list_filter = ('parent',)
+    list_select_related = ('parent',)
     search_fields = ('name', 'description')
     prepopulated_fields = {'slug': ('name',)}
     
     def product_count(self, obj):
-        count = obj.products.count()
+        # Annotation de get_queryset : pas de COUNT par ligne
+        count = obj.product_count
         if count > 0:
             return format_html(
                 '<a href="{}?categories__id__exact={}">{}</a>',
@@ -216,6 +285,7 @@ class ProductCategoryAdmin(admin.ModelAdmin):
             )
         return count
     product_count.short_description = _("Produits")
+    product_count.admin_order_field = 'product_count'
     
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
@@ -229,7 +299,8 @@ class ProductTagAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('name',)}
     
     def product_count(self, obj):
-        count = obj.products.count()
+        # Annotation de get_queryset : pas de COUNT par ligne
+        count = obj.product_count
         if count > 0:
             return format_html(
                 '<a href="{}?tags__id__exact={}">{}</a>',
@@ -239,6 +310,7 @@ class ProductTagAdmin(admin.ModelAdmin):
             )
         return count
     product_count.short_description = _("Produits")
+    product_count.admin_order_field = 'product_count'
     
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
@@ -249,6 +321,13 @@ class ProductTagAdmin(admin.ModelAdmin):
 class ProductAdmin(admin.ModelAdmin):
     list_display = ('name', 'store', 'product_type_badge', 'price_display', 'status_badge', 'main_image_preview', 'created_at')
     list_filter = (ProductTypeFilter, StoreFilter, 'status', PriceRangeFilter, 'categories', 'tags', 'created_at')
+    list_select_related = ('store',)
+    # Colonnes lues par list_display ; la description (texte riche) et les
+    # attributs spécifiques ne sont pas chargés dans la liste
+    changelist_only_fields = (
+        'id', 'name', 'store__id', 'store__name', 'product_type',
+        'price', 'currency', 'status', 'created_at',
+    )
     search_fields = ('name', 'description', 'store__name')
     prepopulated_fields = {'slug': ('name',)}
     readonly_fields = ('created_at', 'updated_at', 'product_preview')
@@ -282,47 +361,26 @@ class ProductAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_changelist(self, request, **kwargs):
+        return OnlyFieldsChangeList
+    
     def product_type_badge(self, obj):
-        type_colors = {
-            'physical': '#3498db',
-            'service': '#2ecc71',
-            'training': '#f39c12'
-        }
-        color = type_colors.get(obj.product_type, '#95a5a6')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 10px;">{}</span>',
-            color,
-            obj.get_product_type_display()
-        )
+        return _badge('product_type', obj.product_type, PRODUCT_TYPE_COLORS, Product.PRODUCT_TYPE_DISPLAY)
     product_type_badge.short_description = _("Type")
     
     def price_display(self, obj):
-        return f"{obj.price} {obj.get_currency_display()}"
+        return f"{obj.price} {Product.CURRENCY_DISPLAY.get(obj.currency, obj.currency)}"
     price_display.short_description = _("Prix")
     
     def status_badge(self, obj):
-        status_colors = {
-            'available': '#2ecc71',
-            'out_of_stock': '#e74c3c',
-            'discontinued': '#95a5a6'
-        }
-        color = status_colors.get(obj.status, '#95a5a6')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 10px;">{}</span>',
-            color,
-            obj.get_status_display()
-        )
+        return _badge('product_status', obj.status, PRODUCT_STATUS_COLORS, Product.STATUS_DISPLAY)
     status_badge.short_description = _("Statut")
     
     def main_image_preview(self, obj):
-        main_image = obj.images.filter(is_main=True).first()
-        if main_image:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', main_image.image.url)
-        
-        # Si pas d'image principale, prendre la première
-        first_image = obj.images.first()
-        if first_image:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', first_image.image.url)
+        # Chemin annoté dans get_queryset : l'image principale, sinon la première
+        if obj.main_image:
+            image_url = ProductImage._meta.get_field('image').storage.url(obj.main_image)
+            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', image_url)
         
         return "-"
     main_image_preview.short_description = _("Image")
@@ -360,6 +418,14 @@ class ProductAdmin(admin.ModelAdmin):
         content = render_to_string('marketplace/product_preview.html', context)
         return HttpResponse(content)
     
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # Sous-requête corrélée : l'image vient avec chaque ligne de produit
+        main_image = ProductImage.objects.filter(
+            product=OuterRef('pk')
+        ).order_by('-is_main', 'id').values('image')[:1]
+        return queryset.annotate(main_image=Subquery(main_image))
+    
     actions = ['make_available', 'mark_out_of_stock', 'mark_discontinued', 'export_products_csv']
     
     def make_available(self, request, queryset):
@@ -378,31 +444,33 @@ class ProductAdmin(admin.ModelAdmin):
     mark_discontinued.short_description = _("Marquer comme discontinué")
     
     def export_products_csv(self, request, queryset):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="products.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID', 'Nom', 'Boutique', 'Type', 'Prix', 'Devise', 'Statut', 
-            'Stock', 'Durée', 'Format', 'Date de création'
-        ])
-        
-        for product in queryset:
-            writer.writerow([
-                product.id,
-                product.name,
-                product.store.name,
-                product.get_product_type_display(),
-                product.price,
-                product.get_currency_display(),
-                product.get_status_display(),
-                product.stock_quantity or '',
-                product.duration or '',
-                product.format or '',
-                product.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        return response
+        # Tuples bruts plutôt qu'instances, boutique jointe ; les libellés sont
+        # lus dans les dictionnaires de choix (traduits à l'écriture de chaque ligne)
+        type_display = Product.PRODUCT_TYPE_DISPLAY
+        currency_display = Product.CURRENCY_DISPLAY
+        status_display = Product.STATUS_DISPLAY
+        rows = (
+            (
+                pk, name, store_name,
+                type_display.get(product_type, product_type),
+                price,
+                currency_display.get(currency, currency),
+                status_display.get(status, status),
+                stock_quantity or '', duration or '', format_ or '',
+                created_at.strftime('%Y-%m-%d %H:%M:%S')
+            )
+            for (pk, name, store_name, product_type, price, currency, status,
+                 stock_quantity, duration, format_, created_at) in queryset.values_list(
+                'id', 'name', 'store__name', 'product_type', 'price', 'currency', 'status',
+                'stock_quantity', 'duration', 'format', 'created_at'
+            ).iterator(chunk_size=2000)
+        )
+        return streaming_csv_response(
+            'products.csv',
+            ['ID', 'Nom', 'Boutique', 'Type', 'Prix', 'Devise', 'Statut',
+             'Stock', 'Durée', 'Format', 'Date de création'],
+            rows
+        )
     export_products_csv.short_description = _("Exporter les produits sélectionnés en CSV")
 
 @admin.register(ProductImage)
@@ -421,12 +489,17 @@ class ProductImageAdmin(admin.ModelAdmin):
     actions = ['make_main_image', 'make_not_main_image']
     
     def make_main_image(self, request, queryset):
-        # D'abord, pour chaque produit concerné, on remet toutes ses images à non-principales
-        for product_id in queryset.values_list('product_id', flat=True).distinct():
-            ProductImage.objects.filter(product_id=product_id).update(is_main=False)
-        
-        # Ensuite, on marque les images sélectionnées comme principales
-        updated = queryset.update(is_main=True)
+        # Un seul UPDATE sur toutes les images des produits concernés : les
+        # images sélectionnées deviennent principales, les autres non
+        selected = list(queryset.values_list('pk', 'product_id'))
+        ProductImage.objects.filter(
+            product_id__in={product_id for _pk, product_id in selected}
+        ).update(is_main=Case(
+            When(pk__in=[pk for pk, _product_id in selected], then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField()
+        ))
+        updated = len(selected)
         self.message_user(request, _(f"{updated} image(s) ont été définies comme principales."))
     make_main_image.short_description = _("Définir comme image principale")
     
@@ -456,12 +529,17 @@ class AddressAdmin(admin.ModelAdmin):
     actions = ['make_default', 'make_not_default']
     
     def make_default(self, request, queryset):
-        # Pour chaque utilisateur concerné, on remet toutes ses adresses à non par défaut
-        for user_id in queryset.values_list('user_id', flat=True).distinct():
-            Address.objects.filter(user_id=user_id).update(is_default=False)
-        
-        # Ensuite, on marque les adresses sélectionnées comme par défaut
-        updated = queryset.update(is_default=True)
+        # Un seul UPDATE sur toutes les adresses des utilisateurs concernés : les
+        # adresses sélectionnées passent par défaut, les autres non
+        selected = list(queryset.values_list('pk', 'user_id'))
+        Address.objects.filter(
+            user_id__in={user_id for _pk, user_id in selected}
+        ).update(is_default=Case(
+            When(pk__in=[pk for pk, _user_id in selected], then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField()
+        ))
+        updated = len(selected)
         self.message_user(request, _(f"{updated} adresse(s) ont été définies comme par défaut."))
     make_default.short_description = _("Définir comme adresse par défaut")
     
@@ -474,6 +552,7 @@ class AddressAdmin(admin.ModelAdmin):
 class OrderAdmin(admin.ModelAdmin):
     list_display = ('order_number', 'customer', 'status_badge', 'total_amount_display', 'item_count', 'created_at')
     list_filter = ('status', 'created_at')
+    list_select_related = ('customer',)
     search_fields = ('order_number', 'customer__username', 'customer__first_name', 'customer__last_name', 'shipping_address__address_line1', 'notes')
     readonly_fields = ('created_at', 'updated_at', 'order_summary', 'payment_status')
     date_hierarchy = 'created_at'
@@ -502,20 +581,7 @@ class OrderAdmin(admin.ModelAdmin):
     )
     
     def status_badge(self, obj):
-        status_colors = {
-            'pending': '#f39c12',
-            'paid': '#3498db',
-            'processing': '#9b59b6',
-            'shipped': '#2ecc71',
-            'delivered': '#27ae60',
-            'cancelled': '#e74c3c'
-        }
-        color = status_colors.get(obj.status, '#95a5a6')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 10px;">{}</span>',
-            color,
-            obj.get_status_display()
-        )
+        return _badge('order_status', obj.status, ORDER_STATUS_COLORS, Order.STATUS_DISPLAY)
     status_badge.short_description = _("Statut")
     
     def total_amount_display(self, obj):
@@ -523,83 +589,41 @@ class OrderAdmin(admin.ModelAdmin):
     total_amount_display.short_description = _("Montant total")
     
     def item_count(self, obj):
-        return obj.items.count()
+        # Annotation de get_queryset : pas de COUNT par ligne
+        return obj.item_count
     item_count.short_description = _("Articles")
+    item_count.admin_order_field = 'item_count'
     
     def payment_status(self, obj):
-        from payments.models import PaymentTransaction
-        
-        try:
-            payment = PaymentTransaction.objects.filter(order=obj).latest('created_at')
-            if payment.status == 'success':
-                return format_html('<span style="color: #2ecc71; font-weight: bold;">✓ Payé</span>')
-            elif payment.status == 'pending':
-                return format_html('<span style="color: #f39c12; font-weight: bold;">⏳ En attente</span>')
-            elif payment.status == 'failed':
-                return format_html('<span style="color: #e74c3c; font-weight: bold;">✗ Échec</span>')
-            else:
-                return format_html('<span style="color: #95a5a6; font-weight: bold;">? Statut inconnu</span>')
-        except:
-            return format_html('<span style="color: #95a5a6; font-weight: bold;">Pas de paiement</span>')
+        # Statut du dernier paiement, annoté dans get_queryset
+        status = getattr(obj, 'latest_payment_status', None)
+        if status is None:
+            return NO_PAYMENT_BADGE
+        return PAYMENT_BADGES.get(status, UNKNOWN_PAYMENT_BADGE)
     payment_status.short_description = _("Statut du paiement")
     
     def order_summary(self, obj):
         if not obj.pk:
             return _("Disponible après enregistrement")
         
-        items = obj.items.all()
-        
-        html = """
-        <div style="margin-top: 10px; padding: 15px; background-color: #f8f9fa; border-radius: 5px;">
-            <h3 style="margin-top: 0;">Résumé de la commande</h3>
-            <table style="width: 100%; border-collapse: collapse;">
-                <thead>
-                    <tr style="background-color: #eee;">
-                        <th style="padding: 8px; text-align: left; border-bottom: 1px solid #ddd;">Produit</th>
-                        <th style="padding: 8px; text-align: center; border-bottom: 1px solid #ddd;">Quantité</th>
-                        <th style="padding: 8px; text-align: right; border-bottom: 1px solid #ddd;">Prix unitaire</th>
-                        <th style="padding: 8px; text-align: right; border-bottom: 1px solid #ddd;">Sous-total</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
-        
-        for item in items:
-            html += f"""
-                <tr>
-                    <td style="padding: 8px; border-bottom: 1px solid #ddd;">{item.product.name}</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #ddd; text-align: center;">{item.quantity}</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #ddd; text-align: right;">{item.price} HTG</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #ddd; text-align: right;">{item.price * item.quantity} HTG</td>
-                </tr>
-            """
-        
-        html += f"""
-                </tbody>
-                <tfoot>
-                    <tr>
-                        <td colspan="3" style="padding: 8px; text-align: right;"><strong>Sous-total:</strong></td>
-                        <td style="padding: 8px; text-align: right;">{obj.total_amount - obj.shipping_cost} HTG</td>
-                    </tr>
-                    <tr>
-                        <td colspan="3" style="padding: 8px; text-align: right;"><strong>Frais de livraison:</strong></td>
-                        <td style="padding: 8px; text-align: right;">{obj.shipping_cost} HTG</td>
-                    </tr>
-                    <tr>
-                        <td colspan="3" style="padding: 8px; text-align: right;"><strong>Total:</strong></td>
-                        <td style="padding: 8px; text-align: right; font-weight: bold;">{obj.total_amount} HTG</td>
-                    </tr>
-                </tfoot>
-            </table>
-        </div>
-        """
-        
-        return format_html(html)
+        # Gabarit compilé une fois puis réutilisé (chargeur de gabarits en cache) ;
+        # produits joints : pas de requête par article pour item.product.name
+        return mark_safe(render_to_string('marketplace/order_summary.html', {
+            'order': obj,
+            'items': obj.items.select_related('product'),
+            'subtotal': obj.total_amount - obj.shipping_cost,
+        }))
     order_summary.short_description = _("Résumé de la commande")
     
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        queryset = queryset.annotate(item_count=Count('items'))
+        latest_payment_status = PaymentTransaction.objects.filter(
+            order=OuterRef('pk')
+        ).order_by('-created_at').values('status')[:1]
+        queryset = queryset.annotate(
+            item_count=Count('items'),
+            latest_payment_status=Subquery(latest_payment_status)
+        )
         return queryset
     
     actions = [
@@ -633,28 +657,31 @@ class OrderAdmin(admin.ModelAdmin):
     mark_as_cancelled.short_description = _("Marquer comme annulées")
     
     def export_orders_csv(self, request, queryset):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="orders.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'Numéro de commande', 'Client', 'Date', 'Statut', 
-            'Montant total', 'Frais de livraison', 'Adresse de livraison'
-        ])
-        
-        for order in queryset:
-            shipping_address = f"{order.shipping_address.address_line1}, {order.shipping_address.city}" if order.shipping_address else "-"
-            writer.writerow([
-                order.order_number,
-                order.customer.get_full_name() or order.customer.username,
-                order.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                order.get_status_display(),
-                order.total_amount,
-                order.shipping_cost,
-                shipping_address
-            ])
-        
-        return response
+        # Client et adresse joints dans la même requête, lue par lots
+        status_display = Order.STATUS_DISPLAY
+        rows = (
+            (
+                order_number,
+                f"{first_name} {last_name}".strip() or username,
+                created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                status_display.get(status, status),
+                total_amount,
+                shipping_cost,
+                f"{address_line1}, {city}" if address_id is not None else "-"
+            )
+            for (order_number, username, first_name, last_name, created_at, status,
+                 total_amount, shipping_cost, address_id, address_line1, city) in queryset.values_list(
+                'order_number', 'customer__username', 'customer__first_name', 'customer__last_name',
+                'created_at', 'status', 'total_amount', 'shipping_cost',
+                'shipping_address_id', 'shipping_address__address_line1', 'shipping_address__city'
+            ).iterator(chunk_size=2000)
+        )
+        return streaming_csv_response(
+            'orders.csv',
+            ['Numéro de commande', 'Client', 'Date', 'Statut',
+             'Montant total', 'Frais de livraison', 'Adresse de livraison'],
+            rows
+        )
     export_orders_csv.short_description = _("Exporter les commandes sélectionnées en CSV")
 
 @admin.register(OrderItem)
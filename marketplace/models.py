@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from core.models import TimeStampedModel
@@ -34,6 +37,14 @@ class Store(TimeStampedModel):
         verbose_name = _("Boutique")
         verbose_name_plural = _("Boutiques")
 
+# Choix (id, nom) du filtre par boutique de l'admin des produits
+STORE_CHOICES_CACHE_KEY = 'marketplace:store_filter_choices'
+
+@receiver([post_save, post_delete], sender=Store)
+def invalidate_store_choices(sender, **kwargs):
+    """Invalide les choix mis en cache par StoreFilter.lookups"""
+    cache.delete(STORE_CHOICES_CACHE_KEY)
+
 class ProductCategory(models.Model):
     """
     Catégories de produits.
@@ -101,6 +112,10 @@ class Product(TimeStampedModel):
         ('HTG', _('Gourde haïtienne')),
         ('USD', _('Dollar américain')),
     )
+    # Libellés indexés par code (get_*_display reconstruit ces dicts à chaque appel)
+    PRODUCT_TYPE_DISPLAY = dict(PRODUCT_TYPE_CHOICES)
+    STATUS_DISPLAY = dict(STATUS_CHOICES)
+    CURRENCY_DISPLAY = dict(CURRENCY_CHOICES)
     
     name = models.CharField(_("Nom"), max_length=200)
     slug = models.SlugField(_("Slug"), max_length=220, unique=True)
@@ -215,6 +230,8 @@ class Order(TimeStampedModel):
         ('delivered', _('Livrée')),
         ('cancelled', _('Annulée')),
     )
+    # Libellés indexés par code (get_status_display reconstruit ce dict à chaque appel)
+    STATUS_DISPLAY = dict(STATUS_CHOICES)
     
     customer = models.ForeignKey(
         User, 